@@ -8,59 +8,78 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
+from torch.utils.checkpoint import checkpoint_sequential
 import torchvision.transforms as transforms
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from database import DatabaseManager
 import base64
 from io import BytesIO
 import random
 import os
+import hashlib
+
+# Star icon outline: 10 alternating outer/inner vertices around the origin
+_STAR_ANGLES = np.arange(10) * (36 * np.pi / 180)
+_STAR_RADII = np.where(np.arange(10) % 2 == 0, 25, 12)
+_STAR_UNIT = np.stack([_STAR_RADII * np.cos(_STAR_ANGLES), _STAR_RADII * np.sin(_STAR_ANGLES)], axis=1)
+
+def text_to_indices(text, vocab, max_length=50):
+    """Convert text to a fixed-length list of vocabulary indices (shared by training and inference)"""
+    words = text.lower().split()[:max_length]
+    indices = [vocab.get(word, vocab['<UNK>']) for word in words if word.isalpha()]
+    
+    # Pad to fixed length
+    indices += [vocab['<PAD>']] * (max_length - len(indices))
+    return indices
 
 class StyleGAN_Generator(nn.Module):
     """Simplified StyleGAN-like generator for asset creation"""
     
-    def __init__(self, latent_dim=100, text_embed_dim=256, img_size=128):
+    def __init__(self, vocab_size, latent_dim=100, text_embed_dim=512, img_size=128):
         super().__init__()
         self.img_size = img_size
         self.latent_dim = latent_dim
         
+        # Mean of learned word vectors per prompt (padding ignored)
+        self.text_embedding = nn.EmbeddingBag(vocab_size, text_embed_dim, mode='mean', padding_idx=0)
+        
         # Text encoder
         self.text_encoder = nn.Sequential(
-            nn.Linear(text_embed_dim, 512),
-            nn.ReLU(),
-            nn.Linear(512, 256),
+            nn.Linear(text_embed_dim, 256),
             nn.ReLU(),
             nn.Linear(256, latent_dim)
         )
         
         # Generator network
         self.generator = nn.Sequential(
-            # Input: latent_dim
-            nn.Linear(latent_dim, 256 * 8 * 8),
-            nn.ReLU(),
+            # Input: latent_dim, reshaped to a 1x1 feature map
+            nn.Unflatten(1, (latent_dim, 1, 1)),
             
-            # Reshape to feature maps
-            nn.Unflatten(1, (256, 8, 8)),
+            # Project to feature maps
+            nn.ConvTranspose2d(latent_dim, 256, 8, 1, 0),  # 1x1 -> 8x8
+            nn.ReLU(),
             
             # Upsampling layers
             nn.ConvTranspose2d(256, 128, 4, 2, 1),  # 8x8 -> 16x16
-            nn.BatchNorm2d(128),
+            nn.GroupNorm(8, 128),
             nn.ReLU(),
             
             nn.ConvTranspose2d(128, 64, 4, 2, 1),   # 16x16 -> 32x32
-            nn.BatchNorm2d(64),
+            nn.GroupNorm(8, 64),
             nn.ReLU(),
             
             nn.ConvTranspose2d(64, 32, 4, 2, 1),    # 32x32 -> 64x64
-            nn.BatchNorm2d(32),
+            nn.GroupNorm(8, 32),
             nn.ReLU(),
             
             nn.ConvTranspose2d(32, 16, 4, 2, 1),    # 64x64 -> 128x128
-            nn.BatchNorm2d(16),
+            nn.GroupNorm(8, 16),
             nn.ReLU(),
             
             # Final layer
@@ -68,9 +87,9 @@ class StyleGAN_Generator(nn.Module):
             nn.Tanh()
         )
         
-    def forward(self, noise, text_embedding):
+    def forward(self, noise, text_tokens):
         # Combine noise with text
-        text_features = self.text_encoder(text_embedding)
+        text_features = self.text_encoder(self.text_embedding(text_tokens))
         combined = noise + text_features
         
         # Generate image
@@ -89,38 +108,54 @@ class AssetDiscriminator(nn.Module):
             nn.LeakyReLU(0.2),
             
             nn.Conv2d(16, 32, 4, 2, 1),             # 64x64 -> 32x32
-            nn.BatchNorm2d(32),
+            nn.GroupNorm(8, 32),
             nn.LeakyReLU(0.2),
             
             nn.Conv2d(32, 64, 4, 2, 1),             # 32x32 -> 16x16
-            nn.BatchNorm2d(64),
+            nn.GroupNorm(8, 64),
             nn.LeakyReLU(0.2),
             
             nn.Conv2d(64, 128, 4, 2, 1),            # 16x16 -> 8x8
-            nn.BatchNorm2d(128),
+            nn.GroupNorm(8, 128),
             nn.LeakyReLU(0.2),
             
             nn.Conv2d(128, 256, 4, 2, 1),           # 8x8 -> 4x4
-            nn.BatchNorm2d(256),
+            nn.GroupNorm(8, 256),
             nn.LeakyReLU(0.2),
             
             # Flatten and classify
             nn.Flatten(),
-            nn.Linear(256 * 4 * 4, 1),
-            nn.Sigmoid()
+            nn.Linear(256 * 4 * 4, 1)               # Raw logits (see BCEWithLogitsLoss)
         )
         
     def forward(self, img):
+        if self.training and torch.is_grad_enabled():
+            # Recompute activations in backward instead of storing them
+            return checkpoint_sequential(self.discriminator, 3, img, use_reentrant=False)
         return self.discriminator(img)
 
 class RealAssetDataset(Dataset):
     """Dataset using our real scraped assets"""
     
-    def __init__(self, db_manager, transform=None, max_samples=1000):
+    IMAGE_SHAPE = (4, 128, 128)  # RGBA tensors as produced by the transform
+    PREVIEW_CACHE_DIR = Path("ai_models/cache/previews")  # Outside downloads/, so the local index and batch_operations never see it
+    
+    # Synthetic shape masks, one 'L' image per color slot, shared by all instances
+    _shape_masks = {}
+    
+    def __init__(self, db_manager, transform=None, max_samples=1000, cache_dir="ai_models/cache"):
         self.db = db_manager
         self.transform = transform
+        self._local_files = self._build_local_index()
         self.assets = self._load_assets(max_samples)
         self.vocab = self._build_vocab()
+        self.text_tokens = self._build_text_tokens()
+        
+        # Decoded images live in a memory-mapped float16 file, opened lazily per worker
+        self.cache_path = self._get_cache_path(cache_dir)
+        self._image_cache = None
+        if self.assets and not self.cache_path.exists():
+            self._materialize_cache()
         
     def _load_assets(self, max_samples):
         """Load assets from database"""
@@ -139,22 +174,31 @@ class RealAssetDataset(Dataset):
         print(f"Loaded {len(filtered_assets)} assets for training")
         return filtered_assets
     
+    def _build_local_index(self, downloads_dir=Path("downloads")):
+        """Index downloads/<site>/[<category>/]<file> with one directory scan each"""
+        index = {}
+        if not downloads_dir.is_dir():
+            return index
+        
+        with os.scandir(downloads_dir) as sites:
+            for site in sites:
+                if not site.is_dir():
+                    continue
+                with os.scandir(site.path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            index[(site.name, entry.name)] = Path(entry.path)
+                        elif entry.is_dir():
+                            with os.scandir(entry.path) as files:
+                                for file in files:
+                                    if file.is_file():
+                                        index[(site.name, entry.name, file.name)] = Path(file.path)
+        
+        return index
+    
     def _has_local_file(self, asset):
         """Check if asset has local file"""
-        downloads_dir = Path("downloads")
-        site = asset.get('source_site', 'unknown')
-        category = asset.get('category', 'other')
-        title = asset.get('title', 'unknown')
-        
-        clean_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-        
-        possible_paths = [
-            downloads_dir / site / category / f"{clean_title}.png",
-            downloads_dir / site / category / f"{clean_title}.jpg",
-            downloads_dir / site / f"{clean_title}.png",
-        ]
-        
-        return any(path.exists() for path in possible_paths)
+        return self._get_local_path(asset) is not None
     
     def _build_vocab(self):
         """Build vocabulary from asset descriptions"""
@@ -176,40 +220,91 @@ class RealAssetDataset(Dataset):
         
         return vocab
     
-    def _text_to_embedding(self, text, max_length=50):
-        """Convert text to embedding vector"""
-        words = text.lower().split()
-        indices = []
-        
-        for word in words[:max_length]:
-            if word.isalpha():
-                indices.append(self.vocab.get(word, self.vocab['<UNK>']))
-        
-        # Pad or truncate to fixed length
-        while len(indices) < max_length:
-            indices.append(self.vocab['<PAD>'])
-        
-        indices = indices[:max_length]
-        
-        # Convert to embedding (simple one-hot average)
-        embedding = torch.zeros(256)
-        for idx in indices:
-            if idx < 256:  # Limit to embedding dimension
-                embedding[idx] = 1.0
-        
-        return embedding / (len(indices) + 1e-8)  # Normalize
+    def _build_text_tokens(self, max_length=50):
+        """Precompute the padded token ids of every asset as one (N, max_length) tensor"""
+        token_rows = [
+            text_to_indices(
+                f"{asset.get('title', '')} {asset.get('description', '')} {asset.get('category', '')}",
+                self.vocab,
+                max_length
+            )
+            for asset in self.assets
+        ]
+        return torch.tensor(token_rows, dtype=torch.long).view(len(self.assets), max_length)
+    
+    def _get_cache_path(self, cache_dir):
+        """Cache file keyed on the asset list, so new scrapes rebuild it"""
+        asset_keys = "\n".join(str(asset.get('id', asset.get('url'))) for asset in self.assets)
+        digest = hashlib.sha1(asset_keys.encode()).hexdigest()[:16]
+        return Path(cache_dir) / f"dataset_{len(self.assets)}_{digest}.f16"
+    
+    def _materialize_cache(self):
+        """Decode, resize and normalize every image once into the memmap cache"""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        to_tensor = self.transform or transforms.ToTensor()
+        self._prefetch_previews()
+        
+        print(f"Caching {len(self.assets)} training images...")
+        cache = np.memmap(tmp_path, dtype=np.float16, mode='w+', shape=(len(self.assets), *self.IMAGE_SHAPE))
+        for i, asset in enumerate(self.assets):
+            cache[i] = to_tensor(self._load_image(asset)).numpy()
+        cache.flush()
+        del cache
+        
+        os.replace(tmp_path, self.cache_path)
+        print(f"Image cache saved: {self.cache_path}")
+    
+    def _preview_cache_path(self, preview_url):
+        """On-disk location of a prefetched preview image"""
+        return self.PREVIEW_CACHE_DIR / f"{hashlib.sha1(preview_url.encode()).hexdigest()}.img"
+    
+    def _prefetch_previews(self, max_workers=32):
+        """Download missing preview images concurrently over one pooled session"""
+        pending = list(dict.fromkeys(
+            asset['preview_url'] for asset in self.assets
+            if asset.get('preview_url')
+            and not self._get_local_path(asset)
+            and not self._preview_cache_path(asset['preview_url']).exists()
+        ))
+        if not pending:
+            return
+        
+        self.PREVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        def fetch(url):
+            try:
+                response = session.get(url, timeout=10)
+                response.raise_for_status()
+                self._preview_cache_path(url).write_bytes(response.content)
+                return True
+            except Exception as e:
+                print(f"Error prefetching {url}: {e}")
+                return False
+        
+        print(f"Prefetching {len(pending)} preview images...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = sum(executor.map(fetch, pending))
+        session.close()
+        print(f"Prefetched {fetched}/{len(pending)} preview images")
     
     def _load_image(self, asset):
         """Load image from asset"""
         try:
             # Try local file first
             local_path = self._get_local_path(asset)
-            if local_path and local_path.exists():
+            if local_path:
                 img = Image.open(local_path).convert('RGBA')
             else:
                 # Try preview URL
                 preview_url = asset.get('preview_url')
-                if preview_url:
+                if preview_url and self._preview_cache_path(preview_url).exists():
+                    img = Image.open(self._preview_cache_path(preview_url)).convert('RGBA')
+                elif preview_url:
                     response = requests.get(preview_url, timeout=10)
                     img = Image.open(BytesIO(response.content)).convert('RGBA')
                 else:
@@ -226,28 +321,26 @@ class RealAssetDataset(Dataset):
     
     def _get_local_path(self, asset):
         """Get local file path"""
-        downloads_dir = Path("downloads")
         site = asset.get('source_site', 'unknown')
         category = asset.get('category', 'other')
         title = asset.get('title', 'unknown')
         
         clean_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
         
-        possible_paths = [
-            downloads_dir / site / category / f"{clean_title}.png",
-            downloads_dir / site / category / f"{clean_title}.jpg",
-            downloads_dir / site / f"{clean_title}.png",
+        possible_keys = [
+            (site, category, f"{clean_title}.png"),
+            (site, category, f"{clean_title}.jpg"),
+            (site, f"{clean_title}.png"),
         ]
         
-        for path in possible_paths:
-            if path.exists():
-                return path
+        for key in possible_keys:
+            if key in self._local_files:
+                return self._local_files[key]
         return None
     
     def _create_synthetic_image(self, asset):
         """Create synthetic training image based on asset metadata"""
         img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
         
         # Determine colors based on category
         category = asset.get('category', 'misc').lower()
@@ -260,22 +353,41 @@ class RealAssetDataset(Dataset):
         elif 'icon' in category:
             colors = [(255, 200, 100), (255, 255, 255)]  # Gold, white
         else:
-            colors = [(random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))]
+            # Seeded per asset so every cache rebuild produces the same target
+            rng = random.Random(str(asset.get('id', asset.get('url', asset.get('title')))))
+            colors = [(rng.randint(100, 255), rng.randint(100, 255), rng.randint(100, 255))]
         
         # Draw based on category
         if 'character' in category:
-            self._draw_character(draw, colors)
+            shape, draw_func = 'character', self._draw_character
         elif 'ui' in category:
-            self._draw_ui_element(draw, colors)
+            shape, draw_func = 'ui', self._draw_ui_element
         elif 'weapon' in category:
-            self._draw_weapon(draw, colors)
+            shape, draw_func = 'weapon', self._draw_weapon
         elif 'icon' in category:
-            self._draw_icon(draw, colors)
+            shape, draw_func = 'icon', self._draw_icon
         else:
-            self._draw_generic(draw, colors)
+            shape, draw_func = 'generic', self._draw_generic
+        
+        # Colorize the cached masks instead of re-running the draw calls
+        for color, mask in zip(colors, self._get_shape_masks(shape, draw_func, len(colors))):
+            img.paste(color, mask=mask)
         
         return img
     
+    def _get_shape_masks(self, shape, draw_func, slot_count):
+        """Render each color slot of a shape into an 'L' mask once and cache it"""
+        key = (shape, slot_count)
+        if key not in self._shape_masks:
+            masks = []
+            for slot in range(slot_count):
+                mask = Image.new('L', (128, 128), 0)
+                draw_func(ImageDraw.Draw(mask), [255 if i == slot else 0 for i in range(slot_count)])
+                masks.append(mask)
+            self._shape_masks[key] = tuple(masks)
+        
+        return self._shape_masks[key]
+    
     def _draw_character(self, draw, colors):
         """Draw character-like shape"""
         color1, color2 = colors[0], colors[1] if len(colors) > 1 else colors[0]
@@ -294,8 +406,9 @@ class RealAssetDataset(Dataset):
     def _draw_ui_element(self, draw, colors):
         """Draw UI element"""
         color1 = colors[0]
+        outline = colors[1] if len(colors) > 1 else (255, 255, 255)
         draw.rounded_rectangle([20, 40, 108, 88], radius=8, fill=color1)
-        draw.rounded_rectangle([20, 40, 108, 88], radius=8, outline=(255, 255, 255), width=2)
+        draw.rounded_rectangle([20, 40, 108, 88], radius=8, outline=outline, width=2)
     
     def _draw_weapon(self, draw, colors):
         """Draw weapon"""
@@ -311,15 +424,8 @@ class RealAssetDataset(Dataset):
         """Draw icon"""
         color1 = colors[0]
         # Star shape
-        points = []
-        center_x, center_y = 64, 64
-        for i in range(10):
-            angle = i * 36 * 3.14159 / 180
-            radius = 25 if i % 2 == 0 else 12
-            x = center_x + radius * np.cos(angle)
-            y = center_y + radius * np.sin(angle)
-            points.append((x, y))
-        draw.polygon(points, fill=color1)
+        points = _STAR_UNIT + (64, 64)
+        draw.polygon([tuple(p) for p in points.tolist()], fill=color1)
     
     def _draw_generic(self, draw, colors):
         """Draw generic shape"""
@@ -332,18 +438,14 @@ class RealAssetDataset(Dataset):
     def __getitem__(self, idx):
         asset = self.assets[idx]
         
-        # Load image
-        image = self._load_image(asset)
-        if self.transform:
-            image = self.transform(image)
-        
-        # Get text embedding
-        text = f"{asset.get('title', '')} {asset.get('description', '')} {asset.get('category', '')}"
-        text_embedding = self._text_to_embedding(text)
+        if self._image_cache is None:
+            self._image_cache = np.memmap(self.cache_path, dtype=np.float16, mode='r',
+                                          shape=(len(self.assets), *self.IMAGE_SHAPE))
+        image = torch.from_numpy(self._image_cache[idx].astype(np.float32))
         
         return {
             'image': image,
-            'text_embedding': text_embedding,
+            'text_tokens': self.text_tokens[idx],
             'category': asset.get('category', 'misc')
         }
 
@@ -354,9 +456,18 @@ class AdvancedAIGenerator:
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         print(f"Using device: {self.device}")
         
+        # Input shapes are static, so let cuDNN pick the fastest conv algorithms once
+        torch.backends.cudnn.benchmark = True
+        
+        # Allow TF32 tensor cores for fp32 matmuls/convs (Ampere+, ignored elsewhere)
+        torch.set_float32_matmul_precision('high')
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        
         self.db = DatabaseManager()
         self.generator = None
         self.discriminator = None
+        self.vocab = None
         
         # Image transforms
         self.transform = transforms.Compose([
@@ -365,70 +476,102 @@ class AdvancedAIGenerator:
             transforms.Normalize(mean=[0.5, 0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5, 0.5])  # RGBA
         ])
         
-    def train_model(self, epochs=50, batch_size=8, lr=0.0002):
+    def train_model(self, epochs=50, batch_size=16, lr=0.0002):
         """Train the GAN model"""
         print("🚀 Starting Advanced AI Training...")
         
         # Prepare dataset
         dataset = RealAssetDataset(self.db, transform=self.transform)
-        dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+        num_workers = min(8, os.cpu_count() or 1)  # Decode/download in parallel with training
+        dataloader = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=num_workers,
+            persistent_workers=True,  # Keep workers alive across epochs
+            prefetch_factor=4,
+            pin_memory=self.device.type == 'cuda'  # Page-locked batches for async H2D copies
+        )
         
         # Initialize models
-        self.generator = StyleGAN_Generator().to(self.device)
+        self.vocab = dataset.vocab
+        self.generator = StyleGAN_Generator(len(self.vocab)).to(self.device)
         self.discriminator = AssetDiscriminator().to(self.device)
         
+        # NHWC layout lets cuDNN use tensor-core conv kernels
+        self.generator = self.generator.to(memory_format=torch.channels_last)
+        self.discriminator = self.discriminator.to(memory_format=torch.channels_last)
+        
+        # Mixed precision + compiled graphs only pay off on CUDA. The compiled
+        # wrappers share parameters with self.generator/self.discriminator, so
+        # save_model keeps writing plain state_dict keys.
+        use_amp = self.device.type == 'cuda'
+        scaler = torch.cuda.amp.GradScaler(enabled=use_amp)
+        if use_amp and hasattr(torch, 'compile') and os.name != 'nt':
+            generator = torch.compile(self.generator)
+            discriminator = torch.compile(self.discriminator)
+        else:
+            generator, discriminator = self.generator, self.discriminator
+        
         # Optimizers
-        g_optimizer = optim.Adam(self.generator.parameters(), lr=lr, betas=(0.5, 0.999))
-        d_optimizer = optim.Adam(self.discriminator.parameters(), lr=lr, betas=(0.5, 0.999))
+        g_params = list(self.generator.parameters())
+        d_params = list(self.discriminator.parameters())
+        g_optimizer = optim.Adam(g_params, lr=lr, betas=(0.5, 0.999))
+        d_optimizer = optim.Adam(d_params, lr=lr, betas=(0.5, 0.999))
         
-        # Loss function
-        criterion = nn.BCELoss()
+        # Loss function (sigmoid fused into the loss, safe under autocast)
+        criterion = nn.BCEWithLogitsLoss()
+        
+        # Label tensors allocated once at full batch size and sliced per step
+        all_real_labels = torch.ones(batch_size, 1, device=self.device)
+        all_fake_labels = torch.zeros(batch_size, 1, device=self.device)
         
         print(f"Training on {len(dataset)} samples for {epochs} epochs")
         
         for epoch in range(epochs):
-            g_loss_total = 0
-            d_loss_total = 0
+            # Losses accumulate on the device; synced once per epoch
+            g_loss_total = torch.zeros((), device=self.device)
+            d_loss_total = torch.zeros((), device=self.device)
             batch_count = 0
             
             for batch in dataloader:
-                real_images = batch['image'].to(self.device)
-                text_embeddings = batch['text_embedding'].to(self.device)
+                real_images = batch['image'].to(self.device, non_blocking=True, memory_format=torch.channels_last)
+                text_tokens = batch['text_tokens'].to(self.device, non_blocking=True)
                 batch_size_actual = real_images.size(0)
                 
-                # Train Discriminator
-                d_optimizer.zero_grad()
-                
-                # Real images
-                real_labels = torch.ones(batch_size_actual, 1).to(self.device)
-                real_output = self.discriminator(real_images)
-                d_loss_real = criterion(real_output, real_labels)
-                
-                # Fake images
-                noise = torch.randn(batch_size_actual, 100).to(self.device)
-                fake_images = self.generator(noise, text_embeddings)
-                fake_labels = torch.zeros(batch_size_actual, 1).to(self.device)
-                fake_output = self.discriminator(fake_images.detach())
-                d_loss_fake = criterion(fake_output, fake_labels)
+                d_optimizer.zero_grad(set_to_none=True)
+                g_optimizer.zero_grad(set_to_none=True)
                 
-                d_loss = d_loss_real + d_loss_fake
-                d_loss.backward()
-                d_optimizer.step()
+                with torch.autocast(device_type=self.device.type, dtype=torch.float16, enabled=use_amp):
+                    # Real images
+                    real_labels = all_real_labels[:batch_size_actual]
+                    real_output = discriminator(real_images)
+                    d_loss_real = criterion(real_output, real_labels)
+                    
+                    # Fake images
+                    noise = torch.randn(batch_size_actual, 100, device=self.device)
+                    fake_images = generator(noise, text_tokens)
+                    fake_labels = all_fake_labels[:batch_size_actual]
+                    fake_output = discriminator(fake_images)  # Shared by both losses
+                    d_loss_fake = criterion(fake_output, fake_labels)
+                    
+                    d_loss = d_loss_real + d_loss_fake
+                    g_loss = criterion(fake_output, real_labels)  # Want discriminator to think fake is real
                 
-                # Train Generator
-                g_optimizer.zero_grad()
+                # Route each loss only into its own network's gradients
+                scaler.scale(d_loss).backward(inputs=d_params, retain_graph=True)
+                scaler.scale(g_loss).backward(inputs=g_params)
                 
-                fake_output = self.discriminator(fake_images)
-                g_loss = criterion(fake_output, real_labels)  # Want discriminator to think fake is real
-                g_loss.backward()
-                g_optimizer.step()
+                scaler.step(d_optimizer)
+                scaler.step(g_optimizer)
+                scaler.update()
                 
-                g_loss_total += g_loss.item()
-                d_loss_total += d_loss.item()
+                g_loss_total += g_loss.detach()
+                d_loss_total += d_loss.detach()
                 batch_count += 1
             
-            avg_g_loss = g_loss_total / batch_count
-            avg_d_loss = d_loss_total / batch_count
+            avg_g_loss = g_loss_total.item() / batch_count
+            avg_d_loss = d_loss_total.item() / batch_count
             
             print(f"Epoch [{epoch+1}/{epochs}] - G_Loss: {avg_g_loss:.4f}, D_Loss: {avg_d_loss:.4f}")
             
@@ -448,6 +591,7 @@ class AdvancedAIGenerator:
         torch.save({
             'generator_state_dict': self.generator.state_dict(),
             'discriminator_state_dict': self.discriminator.state_dict(),
+            'vocab': self.vocab,
             'model_type': 'advanced_gan'
         }, model_dir / filename)
         
@@ -463,10 +607,17 @@ class AdvancedAIGenerator:
         
         checkpoint = torch.load(model_path, map_location=self.device)
         
-        self.generator = StyleGAN_Generator().to(self.device)
+        self.vocab = checkpoint['vocab']
+        self.generator = StyleGAN_Generator(len(self.vocab)).to(self.device)
         self.generator.load_state_dict(checkpoint['generator_state_dict'])
         self.generator.eval()
         
+        # Inference only: script the generator to drop per-module Python dispatch
+        try:
+            self.generator = torch.jit.script(self.generator)
+        except Exception as e:
+            print(f"TorchScript unavailable, using eager generator: {e}")
+        
         print(f"✅ Advanced model loaded from {model_path}")
         return True
     
@@ -475,29 +626,19 @@ class AdvancedAIGenerator:
         if not self.generator:
             return None
         
-        # Create text embedding (simplified)
-        words = prompt.lower().split()
-        text_embedding = torch.zeros(256).to(self.device)
-        
-        # Simple word-to-embedding mapping
-        for i, word in enumerate(words[:10]):  # Max 10 words
-            hash_val = hash(word) % 256
-            text_embedding[hash_val] = 1.0
-        
-        text_embedding = text_embedding.unsqueeze(0)  # Add batch dimension
+        # Tokenize exactly like the training data
+        text_tokens = torch.tensor([text_to_indices(prompt, self.vocab)], dtype=torch.long, device=self.device)
         
         # Generate noise
         noise = torch.randn(1, 100).to(self.device)
         
         # Generate image
         with torch.no_grad():
-            generated_image = self.generator(noise, text_embedding)
+            generated_image = self.generator(noise, text_tokens)
             
-            # Convert to PIL Image
-            image_np = generated_image.squeeze().cpu().numpy()
-            image_np = (image_np + 1) / 2  # Denormalize
-            image_np = np.transpose(image_np, (1, 2, 0))
-            image_np = (image_np * 255).astype(np.uint8)
+            # Denormalize, quantize and move to HWC on the device, then one D2H copy
+            image_np = ((generated_image[0].clamp(-1, 1) + 1) * 127.5).to(torch.uint8)
+            image_np = image_np.permute(1, 2, 0).contiguous().cpu().numpy()
             
             # Handle RGBA
             if image_np.shape[2] == 4:
@@ -523,7 +664,7 @@ def main():
     
     if choice == "1":
         print("🚀 Starting advanced model training...")
-        generator.train_model(epochs=30, batch_size=4)
+        generator.train_model(epochs=30, batch_size=8)
         
     elif choice == "2":
         if generator.load_model():
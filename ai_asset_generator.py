@@ -7,6 +7,7 @@ Web-ready implementation for generating 2D game assets
 
 import os
 import json
+import threading
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -16,72 +17,196 @@ from PIL import Image
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Tuple
+from collections import Counter
 import sqlite3
 from database import DatabaseManager
-import requests
+import asyncio
+import aiohttp
 from io import BytesIO
 import base64
+import hashlib
 
 class AssetDataset(Dataset):
     """Dataset class for training AI model with our scraped assets"""
     
-    def __init__(self, assets_data: List[Dict], transform=None, max_size=512):
+    IMAGE_SHAPE = (3, 256, 256)  # uint8 RGB tensors as produced by the transform
+    VOCAB_PATH = Path("ai_models/vocab.json")
+    PREVIEW_CACHE_DIR = Path("ai_models/cache/previews")  # Outside downloads/, which batch_operations reorganizes
+    
+    def __init__(self, assets_data: List[Dict], transform=None, max_size=512, cache_dir: str = "ai_models/cache"):
         self.assets_data = assets_data
         self.transform = transform
         self.max_size = max_size
         
         # Text preprocessing
-        self.vocab = self._build_vocabulary()
+        self.texts = [
+            f"{asset.get('title', '')} {asset.get('description', '')} {asset.get('category', '')}"
+            for asset in assets_data
+        ]
+        self.vocab = self._load_vocabulary() or self._build_vocabulary()
         self.max_text_length = 50
+        self.text_ids = self._build_text_ids()
+        
+        # downloads/ file index, built on first local path lookup
+        self.path_index = None
+        
+        # Preprocessed uint8 images live in a memory-mapped file, opened lazily per worker
+        self.cache_path = self._get_cache_path(cache_dir)
+        self._image_cache = None
+        if self.assets_data and not self.cache_path.exists():
+            self.prebuild_cache()
+        
+    def _get_cache_path(self, cache_dir: str) -> Path:
+        """Cache file keyed on the asset list, so new scrapes rebuild it"""
+        asset_keys = "\n".join(str(asset.get('id', asset.get('url'))) for asset in self.assets_data)
+        digest = hashlib.sha1(asset_keys.encode()).hexdigest()[:16]
+        return Path(cache_dir) / f"assets_{len(self.assets_data)}_{digest}.u8"
+    
+    def prebuild_cache(self):
+        """Load and transform every image once into the memmap cache"""
+        self.prefetch_remote()  # Remote previews land in PREVIEW_CACHE_DIR before any decode
+        
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        to_tensor = self.transform or transforms.PILToTensor()
+        
+        print(f"Caching {len(self.assets_data)} training images...")
+        cache = np.memmap(tmp_path, dtype=np.uint8, mode='w+', shape=(len(self.assets_data), *self.IMAGE_SHAPE))
+        for i, asset in enumerate(self.assets_data):
+            cache[i] = to_tensor(self._load_image(asset)).numpy()
+        cache.flush()
+        del cache
+        
+        os.replace(tmp_path, self.cache_path)
+        print(f"Image cache saved: {self.cache_path}")
+    
+    def prefetch_remote(self, concurrency: int = 32):
+        """Download preview images that have no local file, concurrently"""
+        missing = list(dict.fromkeys(
+            asset['preview_url'] for asset in self.assets_data
+            if asset.get('preview_url')
+            and self._get_local_path(asset) is None
+            and not self._preview_cache_path(asset['preview_url']).exists()
+        ))
+        if not missing:
+            return
         
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass  # No loop running, asyncio.run below is safe
+        else:
+            # asyncio.run cannot nest; callers inside a loop should await _fetch_previews themselves
+            print(f"Skipping prefetch of {len(missing)} preview images: called from a running event loop")
+            return
+        
+        print(f"Prefetching {len(missing)} preview images...")
+        self.PREVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fetched = asyncio.run(self._fetch_previews(missing, concurrency))
+        print(f"Prefetched {fetched}/{len(missing)} preview images")
+    
+    def _preview_cache_path(self, preview_url: str) -> Path:
+        """On-disk location of a prefetched preview image"""
+        return self.PREVIEW_CACHE_DIR / f"{hashlib.sha1(preview_url.encode()).hexdigest()}.img"
+    
+    async def _fetch_previews(self, urls: List[str], concurrency: int, retries: int = 2) -> int:
+        """Fetch previews with at most `concurrency` requests in flight"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(session: aiohttp.ClientSession, url: str) -> bool:
+            async with semaphore:
+                try:
+                    for attempt in range(retries + 1):
+                        try:
+                            async with session.get(url) as response:
+                                response.raise_for_status()
+                                content = await response.read()
+                            break
+                        except (aiohttp.ClientError, asyncio.TimeoutError):
+                            if attempt == retries:
+                                raise
+                            await asyncio.sleep(0.2 * 2 ** attempt)  # Backoff before retrying
+                    
+                    # Write via a temp file so a failed fetch never leaves a truncated cache entry
+                    cache_path = self._preview_cache_path(url)
+                    tmp_path = cache_path.with_suffix('.tmp')
+                    tmp_path.write_bytes(content)
+                    os.replace(tmp_path, cache_path)
+                    return True
+                    
+                except Exception as e:
+                    print(f"Error prefetching image {url}: {e}")
+                    return False
+        
+        # One pooled connector, so keep-alive sockets (and TLS sessions) are reused per host
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10)) as session:
+            results = await asyncio.gather(*(fetch(session, url) for url in urls))
+        
+        return sum(results)
+    
+    def _corpus_signature(self) -> str:
+        """Fingerprint of the text corpus, so any edited title or description rebuilds the vocab"""
+        return hashlib.sha1("\n".join(self.texts).encode()).hexdigest()
+    
+    def _load_vocabulary(self):
+        """Reuse the persisted vocabulary if the corpus has not changed"""
+        try:
+            with open(self.VOCAB_PATH, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('corpus_signature') == self._corpus_signature():
+                return saved['vocab']
+        except (OSError, ValueError, KeyError):
+            pass  # Missing or unreadable, rebuild
+        return None
+    
     def _build_vocabulary(self):
         """Build vocabulary from asset titles and descriptions"""
         vocab = {'<PAD>': 0, '<UNK>': 1, '<START>': 2, '<END>': 3}
-        word_count = {}
-        
-        for asset in self.assets_data:
-            text = f"{asset.get('title', '')} {asset.get('description', '')} {asset.get('category', '')}"
-            words = text.lower().split()
-            
-            for word in words:
-                word_count[word] = word_count.get(word, 0) + 1
+        word_count = Counter(word for text in self.texts for word in text.lower().split())
         
         # Add words that appear at least 2 times
         for word, count in word_count.items():
             if count >= 2 and word not in vocab:
                 vocab[word] = len(vocab)
         
+        # Persist for the next run over the same corpus
+        try:
+            self.VOCAB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.VOCAB_PATH, 'w', encoding='utf-8') as f:
+                json.dump({'corpus_signature': self._corpus_signature(), 'vocab': vocab}, f)
+        except OSError as e:
+            print(f"Could not save vocabulary: {e}")
+        
         return vocab
     
-    def _text_to_tensor(self, text: str) -> torch.Tensor:
-        """Convert text to tensor"""
-        words = text.lower().split()
-        indices = [self.vocab.get('<START>')]
-        
-        for word in words[:self.max_text_length-2]:
-            indices.append(self.vocab.get(word, self.vocab['<UNK>']))
-        
-        indices.append(self.vocab.get('<END>'))
-        
-        # Pad to max length
-        while len(indices) < self.max_text_length:
-            indices.append(self.vocab.get('<PAD>'))
-        
-        return torch.tensor(indices[:self.max_text_length])
+    def _build_text_ids(self) -> torch.Tensor:
+        """Tokenize every asset text once into a padded (N, max_text_length) tensor"""
+        text_ids = torch.zeros((len(self.texts), self.max_text_length), dtype=torch.long)  # <PAD> is 0
+        
+        vocab_get = self.vocab.get
+        unk, start, end = self.vocab['<UNK>'], self.vocab['<START>'], self.vocab['<END>']
+        for row, text in enumerate(self.texts):
+            words = text.lower().split()[:self.max_text_length-2]
+            indices = [start] + [vocab_get(word, unk) for word in words] + [end]
+            text_ids[row, :len(indices)] = torch.tensor(indices)
+        
+        return text_ids
     
     def _load_image(self, asset: Dict) -> Image.Image:
         """Load image from asset data"""
         try:
             # Try to load from local downloads first
             local_path = self._get_local_path(asset)
-            if local_path and local_path.exists():
+            if local_path:
                 return Image.open(local_path).convert('RGB')
             
-            # Fallback to preview URL
+            # Remote previews are fetched up front by prefetch_remote
             preview_url = asset.get('preview_url')
             if preview_url:
-                response = requests.get(preview_url, timeout=10)
-                return Image.open(BytesIO(response.content)).convert('RGB')
+                cache_path = self._preview_cache_path(preview_url)
+                if cache_path.exists():
+                    return Image.open(cache_path).convert('RGB')
             
             # Create placeholder image
             return Image.new('RGB', (256, 256), color='white')
@@ -90,9 +215,30 @@ class AssetDataset(Dataset):
             print(f"Error loading image for {asset.get('title', 'unknown')}: {e}")
             return Image.new('RGB', (256, 256), color='white')
     
-    def _get_local_path(self, asset: Dict) -> Path:
-        """Get local file path for asset"""
-        downloads_dir = Path("downloads")
+    def _build_path_index(self, downloads_dir: Path = Path("downloads")) -> Dict[Tuple[str, ...], Path]:
+        """Index downloads/<site>/[<category>/]<file> with one directory scan each"""
+        index = {}
+        if not downloads_dir.is_dir():
+            return index
+        
+        with os.scandir(downloads_dir) as sites:
+            for site in sites:
+                if not site.is_dir():
+                    continue
+                with os.scandir(site.path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            index[(site.name, entry.name)] = Path(entry.path)
+                        elif entry.is_dir():
+                            with os.scandir(entry.path) as files:
+                                for file in files:
+                                    if file.is_file():
+                                        index[(site.name, entry.name, file.name)] = Path(file.path)
+        
+        return index
+    
+    def _local_path_keys(self, asset: Dict) -> List[Tuple[str, ...]]:
+        """Candidate downloads/ index keys for an asset, in lookup order"""
         site = asset.get('source_site', 'unknown')
         category = asset.get('category', 'other')
         title = asset.get('title', 'unknown')
@@ -100,17 +246,22 @@ class AssetDataset(Dataset):
         # Clean filename
         clean_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
         
-        possible_paths = [
-            downloads_dir / site / category / f"{clean_title}.png",
-            downloads_dir / site / category / f"{clean_title}.jpg",
-            downloads_dir / site / category / f"{clean_title}.jpeg",
-            downloads_dir / site / f"{clean_title}.png",
-            downloads_dir / site / f"{clean_title}.jpg",
+        return [
+            (site, category, f"{clean_title}.png"),
+            (site, category, f"{clean_title}.jpg"),
+            (site, category, f"{clean_title}.jpeg"),
+            (site, f"{clean_title}.png"),
+            (site, f"{clean_title}.jpg"),
         ]
+    
+    def _get_local_path(self, asset: Dict) -> Path:
+        """Get local file path for asset"""
+        if self.path_index is None:
+            self.path_index = self._build_path_index()
         
-        for path in possible_paths:
-            if path.exists():
-                return path
+        for key in self._local_path_keys(asset):
+            if key in self.path_index:
+                return self.path_index[key]
         
         return None
     
@@ -120,18 +271,15 @@ class AssetDataset(Dataset):
     def __getitem__(self, idx):
         asset = self.assets_data[idx]
         
-        # Load and process image
-        image = self._load_image(asset)
-        if self.transform:
-            image = self.transform(image)
-        
-        # Process text
-        text = f"{asset.get('title', '')} {asset.get('description', '')} {asset.get('category', '')}"
-        text_tensor = self._text_to_tensor(text)
+        # Slice the preprocessed image from the cache
+        if self._image_cache is None:
+            self._image_cache = np.memmap(self.cache_path, dtype=np.uint8, mode='r',
+                                          shape=(len(self.assets_data), *self.IMAGE_SHAPE))
+        image = torch.from_numpy(np.array(self._image_cache[idx]))  # uint8, normalized on the device
         
         return {
             'image': image,
-            'text': text_tensor,
+            'text': self.text_ids[idx],
             'category': asset.get('category', 'misc'),
             'asset_type': asset.get('asset_type', '2d')
         }
@@ -142,32 +290,55 @@ class TextToAssetGenerator(nn.Module):
     def __init__(self, vocab_size: int, embed_dim: int = 256, hidden_dim: int = 512):
         super().__init__()
         
+        # fp16 Tensor Core GEMMs need dimensions that are multiples of 8 - round up instead of rejecting
+        embed_dim = -(-embed_dim // 8) * 8
+        hidden_dim = -(-hidden_dim // 8) * 8
+        
         # Text encoder
         self.text_embedding = nn.Embedding(vocab_size, embed_dim)
-        self.text_lstm = nn.LSTM(embed_dim, hidden_dim, batch_first=True)
+        self.text_gru = nn.GRU(embed_dim, hidden_dim, batch_first=True)  # Only the final hidden state is used
         self.text_fc = nn.Linear(hidden_dim, 256)
         
-        # Image generator (simplified GAN-like structure)
+        # Image generator (DCGAN-style transposed-conv decoder)
         self.generator = nn.Sequential(
-            nn.Linear(256, 512),
+            nn.Unflatten(1, (256, 1, 1)),
+            
+            nn.ConvTranspose2d(256, 512, 4, 1, 0),  # 1x1 -> 4x4
+            nn.BatchNorm2d(512),
             nn.ReLU(),
-            nn.Linear(512, 1024),
+            
+            nn.ConvTranspose2d(512, 256, 4, 2, 1),  # 4x4 -> 8x8
+            nn.BatchNorm2d(256),
             nn.ReLU(),
-            nn.Linear(1024, 2048),
+            
+            nn.ConvTranspose2d(256, 128, 4, 2, 1),  # 8x8 -> 16x16
+            nn.BatchNorm2d(128),
+            nn.ReLU(),
+            
+            nn.ConvTranspose2d(128, 64, 4, 2, 1),   # 16x16 -> 32x32
+            nn.BatchNorm2d(64),
+            nn.ReLU(),
+            
+            nn.ConvTranspose2d(64, 32, 4, 2, 1),    # 32x32 -> 64x64
+            nn.BatchNorm2d(32),
+            nn.ReLU(),
+            
+            nn.ConvTranspose2d(32, 16, 4, 2, 1),    # 64x64 -> 128x128
+            nn.BatchNorm2d(16),
             nn.ReLU(),
-            nn.Linear(2048, 256 * 256 * 3),  # 256x256 RGB image
+            
+            nn.ConvTranspose2d(16, 3, 4, 2, 1),     # 128x128 -> 256x256 RGB image
             nn.Tanh()
         )
         
     def forward(self, text_input):
         # Encode text
         embedded = self.text_embedding(text_input)
-        lstm_out, (hidden, _) = self.text_lstm(embedded)
+        _, hidden = self.text_gru(embedded)
         text_features = self.text_fc(hidden[-1])
         
         # Generate image
-        generated_image = self.generator(text_features)
-        generated_image = generated_image.view(-1, 3, 256, 256)
+        generated_image = self.generator(text_features).contiguous(memory_format=torch.channels_last)
         
         return generated_image
 
@@ -175,15 +346,17 @@ class AIAssetTrainer:
     """Main trainer class for the AI asset generation model"""
     
     def __init__(self):
+        # Text length and image size are fixed, so let cuDNN pick the fastest RNN/conv algorithms once
+        torch.backends.cudnn.benchmark = True
+        
         self.db = DatabaseManager()
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         print(f"Using device: {self.device}")
         
-        # Data transforms
+        # Data transforms (uint8 output; normalization to [-1, 1] happens on the device)
         self.transform = transforms.Compose([
             transforms.Resize((256, 256)),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5])
+            transforms.PILToTensor()
         ])
         
     def prepare_dataset(self) -> AssetDataset:
@@ -213,16 +386,30 @@ class AIAssetTrainer:
         
         # Prepare dataset
         dataset = self.prepare_dataset()
-        dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+        num_workers = max(1, (os.cpu_count() or 2) // 2)
+        dataloader = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=num_workers,
+            persistent_workers=True,  # Keep workers alive across epochs
+            prefetch_factor=2,  # Small, to bound pinned host memory
+            pin_memory=self.device.type == 'cuda'  # Page-locked batches for async H2D copies
+        )
         
         # Initialize model
         vocab_size = len(dataset.vocab)
         model = TextToAssetGenerator(vocab_size).to(self.device)
+        model = model.to(memory_format=torch.channels_last)  # NHWC image layout
         
         # Loss and optimizer
         criterion = nn.MSELoss()
         optimizer = optim.Adam(model.parameters(), lr=learning_rate)
         
+        # Mixed precision on CUDA: fp16 autocast with dynamic loss scaling
+        use_amp = self.device.type == 'cuda'
+        scaler = torch.cuda.amp.GradScaler(enabled=use_amp)
+        
         print(f"Model initialized with vocab size: {vocab_size}")
         print(f"Training on {len(dataset)} samples for {epochs} epochs")
         
@@ -233,19 +420,22 @@ class AIAssetTrainer:
             batch_count = 0
             
             for batch in dataloader:
-                text_input = batch['text'].to(self.device)
-                real_images = batch['image'].to(self.device)
+                text_input = batch['text'].to(self.device, non_blocking=True)
+                real_images = batch['image'].to(self.device, non_blocking=True, memory_format=torch.channels_last)
+                real_images = real_images.float().div_(127.5).sub_(1.0)  # Same as Normalize(0.5, 0.5)
                 
                 # Forward pass
                 optimizer.zero_grad()
-                generated_images = model(text_input)
-                
-                # Calculate loss
-                loss = criterion(generated_images, real_images)
+                with torch.autocast(device_type=self.device.type, dtype=torch.float16, enabled=use_amp):
+                    generated_images = model(text_input)
+                    
+                    # Calculate loss
+                    loss = criterion(generated_images, real_images)
                 
                 # Backward pass
-                loss.backward()
-                optimizer.step()
+                scaler.scale(loss).backward()
+                scaler.step(optimizer)
+                scaler.update()
                 
                 total_loss += loss.item()
                 batch_count += 1
@@ -268,14 +458,19 @@ class AIAssetTrainer:
         model_dir = Path("ai_models")
         model_dir.mkdir(exist_ok=True)
         
+        # Store float weights as fp16 to halve checkpoint size; buffers like num_batches_tracked stay as-is
+        state_dict = {k: v.detach().half().cpu() if v.is_floating_point() else v.cpu()
+                      for k, v in model.state_dict().items()}
+        
         torch.save({
-            'model_state_dict': model.state_dict(),
+            'model_state_dict': state_dict,
             'vocab': vocab,
             'model_config': {
                 'vocab_size': len(vocab),
                 'embed_dim': 256,
                 'hidden_dim': 512
-            }
+            },
+            'dtype': 'fp16'
         }, model_dir / filename)
         
         print(f"Model saved: {model_dir / filename}")
@@ -283,6 +478,8 @@ class AIAssetTrainer:
 class WebAssetGenerator:
     """Web-ready asset generator for production use"""
     
+    GRAPH_BATCH_SIZE = 8  # Fixed batch shape captured into a CUDA graph
+    
     def __init__(self, model_path: str = "ai_models/final_model.pth"):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model_path = Path(model_path)
@@ -307,8 +504,25 @@ class WebAssetGenerator:
             hidden_dim=config['hidden_dim']
         ).to(self.device)
         
-        self.model.load_state_dict(checkpoint['model_state_dict'])
+        state_dict = checkpoint['model_state_dict']
+        if checkpoint.get('dtype') == 'fp16':
+            # Upcast fp16 checkpoint weights back to fp32
+            state_dict = {k: v.float() if v.is_floating_point() else v for k, v in state_dict.items()}
+        
+        self.model.load_state_dict(state_dict)
         self.model.eval()
+        self._graph = None  # Captured lazily on the first CUDA batch
+        self._graph_lock = threading.Lock()  # The graph's static buffers are shared by all callers
+        
+        # Inference only: script the model to drop per-module Python dispatch
+        try:
+            self.model = torch.jit.script(self.model)
+        except Exception as e:
+            print(f"⚠️ TorchScript unavailable, using eager model: {e}")
+        
+        # Warm up (JIT optimization passes, CUDA graph capture) before the first request
+        with torch.inference_mode():
+            self._run_model(torch.zeros((1, 50), dtype=torch.long, device=self.device))
         
         print(f"✅ Model loaded from {self.model_path}")
     
@@ -317,27 +531,75 @@ class WebAssetGenerator:
         if not self.model or not self.vocab:
             return None
         
-        # Preprocess text
-        text_tensor = self._text_to_tensor(text_prompt).unsqueeze(0).to(self.device)
+        return self.generate_assets([text_prompt])[0]
+    
+    def generate_assets(self, text_prompts: List[str]) -> List[str]:
+        """Generate assets for several prompts in fixed-size batches, returned as base64"""
+        if not self.model or not self.vocab:
+            return [None] * len(text_prompts)
         
-        # Generate image
-        with torch.no_grad():
-            generated_image = self.model(text_tensor)
-            
-            # Convert to PIL Image
-            image_np = generated_image.squeeze().cpu().numpy()
-            image_np = (image_np + 1) / 2  # Denormalize from [-1, 1] to [0, 1]
-            image_np = np.transpose(image_np, (1, 2, 0))
-            image_np = (image_np * 255).astype(np.uint8)
-            
-            image = Image.fromarray(image_np)
+        results = []
+        with torch.inference_mode():
+            for start in range(0, len(text_prompts), self.GRAPH_BATCH_SIZE):
+                prompts = text_prompts[start:start + self.GRAPH_BATCH_SIZE]
+                text_batch = torch.stack([self._text_to_tensor(prompt) for prompt in prompts]).to(self.device)
+                
+                generated_images = self._run_model(text_batch)
+                
+                # Denormalize, quantize and move to HWC on the device, then one uint8 D2H copy per batch
+                images = ((generated_images.clamp(-1, 1) + 1) * 127.5).to(torch.uint8)
+                images = images.permute(0, 2, 3, 1).contiguous().cpu().numpy()
+                results.extend(self._image_to_base64(image) for image in images)
+        
+        return results
+    
+    def _run_model(self, text_batch: torch.Tensor) -> torch.Tensor:
+        """Run the model, replaying the captured CUDA graph when available"""
+        if self.device.type != 'cuda':
+            return self.model(text_batch)
+        
+        with self._graph_lock:
+            if self._graph is None:
+                self._capture_graph()
+            if self._graph:
+                # Pad the batch up to the captured shape with <PAD> rows
+                batch_count = text_batch.size(0)
+                self._static_input.zero_()
+                self._static_input[:batch_count].copy_(text_batch)
+                self._graph.replay()
+                # Copy out before releasing the lock - the next replay overwrites the static output
+                return self._static_output[:batch_count].clone()
+        
+        return self.model(text_batch)
+    
+    def _capture_graph(self):
+        """Capture one fixed-shape forward pass into a CUDA graph"""
+        try:
+            self._static_input = torch.zeros((self.GRAPH_BATCH_SIZE, 50), dtype=torch.long, device=self.device)
             
-            # Convert to base64 for web
-            buffer = BytesIO()
-            image.save(buffer, format='PNG')
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
+            # Warm up on a side stream before capture, as CUDA graphs require
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self.model(self._static_input)
+            torch.cuda.current_stream().wait_stream(stream)
             
-            return image_base64
+            self._graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self._graph):
+                self._static_output = self.model(self._static_input)
+        except Exception as e:
+            print(f"⚠️ CUDA graph capture failed, using eager inference: {e}")
+            self._graph = False
+    
+    def _image_to_base64(self, image_np: np.ndarray) -> str:
+        """Convert one uint8 (H, W, 3) image to a base64 PNG"""
+        image = Image.fromarray(image_np)
+        
+        # Convert to base64 for web
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        return base64.b64encode(buffer.getvalue()).decode()
     
     def _text_to_tensor(self, text: str, max_length: int = 50) -> torch.Tensor:
         """Convert text to tensor using loaded vocabulary"""
@@ -368,7 +630,7 @@ def main():
     
     if choice == "1":
         print("🚀 Starting model training...")
-        model, vocab = trainer.train_model(epochs=20, batch_size=4)
+        model, vocab = trainer.train_model(epochs=20, batch_size=8)
         print("✅ Training completed!")
         
     elif choice == "2":
@@ -1,7 +1,8 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from database import DatabaseManager
-from downloader import AssetDownloader
+from downloader import AssetDownloader, close_shared_session
 from scrapers.craftpix_scraper import CraftPixScraper
 from scrapers.kenney_scraper import KenneyScraper
 from scrapers.opengameart_scraper import OpenGameArtScraper
@@ -43,21 +44,30 @@ class AssetManager:
             scraper = self.scrapers[site_name]
             assets = scraper.scrape_assets(limit)
             
-            # Save assets to database
-            saved_count = 0
-            for asset_data in assets:
+            # Prepare assets for saving
+            def resolve_download_url(asset_data):
                 try:
                     # Get download URL if not already present
                     if not asset_data.get('download_url'):
                         download_url = scraper.get_download_url(asset_data['url'])
                         asset_data['download_url'] = download_url
-                    
-                    asset_id = self.db.add_asset(asset_data)
-                    asset_data['id'] = asset_id
-                    saved_count += 1
+                    return True
                     
                 except Exception as e:
                     print(f"Error saving asset {asset_data.get('title', 'Unknown')}: {e}")
+                    return False
+            
+            # Page fetches overlap; the scraper's own delay still paces requests to the site
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                resolved = list(executor.map(resolve_download_url, assets))
+            rows = [asset_data for asset_data, ok in zip(assets, resolved) if ok]
+            
+            # Save assets to database in one transaction
+            saved_count = 0
+            for asset_data, asset_id in zip(rows, self.db.add_assets_bulk(rows)):
+                if asset_id is not None:
+                    asset_data['id'] = asset_id
+                    saved_count += 1
             
             self.db.update_site_status(site_name, 'completed', saved_count)
             print(f"Scraped {saved_count} assets from {site_name}")
@@ -71,24 +81,29 @@ class AssetManager:
     
     def scrape_all_sites(self, limit_per_site: int = None) -> Dict[str, List[Dict]]:
         """Scrape assets from all enabled sites"""
-        all_assets = {}
-        
+        enabled_sites = []
         for site_name in self.scrapers.keys():
             if config.SITES_CONFIG.get(site_name, {}).get('enabled', False):
-                assets = self.scrape_site(site_name, limit_per_site)
-                all_assets[site_name] = assets
+                enabled_sites.append(site_name)
             else:
                 print(f"Skipping disabled site: {site_name}")
         
-        return all_assets
+        if not enabled_sites:
+            return {}
+        
+        # Sites are independent and network-bound, so scrape them in parallel.
+        # DatabaseManager keeps one SQLite connection per thread and WAL lets the workers write concurrently.
+        with ThreadPoolExecutor(max_workers=len(enabled_sites)) as executor:
+            futures = {
+                site_name: executor.submit(self.scrape_site, site_name, limit_per_site)
+                for site_name in enabled_sites
+            }
+            return {site_name: future.result() for site_name, future in futures.items()}
     
     def download_assets(self, filters: Dict = None, limit: int = None) -> Dict:
         """Download assets based on filters"""
-        # Get assets from database
-        assets = self.db.get_assets(filters)
-        
-        if limit:
-            assets = assets[:limit]
+        # Get assets from database (LIMIT applied in SQL)
+        assets = self.db.get_assets(filters, limit=limit or None)
         
         if not assets:
             print("No assets found matching the criteria")
@@ -110,8 +125,11 @@ class AssetManager:
     
     async def _download_assets_async(self, assets: List[Dict]) -> Dict:
         """Async method to download assets"""
-        async with AssetDownloader(self.db) as downloader:
-            return await downloader.download_multiple_assets(assets)
+        try:
+            async with AssetDownloader(self.db) as downloader:
+                return await downloader.download_multiple_assets(assets)
+        finally:
+            await close_shared_session()  # asyncio.run closes this loop next
     
     def download_single_asset(self, asset_id: int) -> bool:
         """Download a single asset by ID"""
@@ -130,22 +148,8 @@ class AssetManager:
     
     def search_assets(self, query: str, filters: Dict = None) -> List[Dict]:
         """Search assets by title or description"""
-        all_assets = self.db.get_assets(filters)
-        
-        query_lower = query.lower()
-        matching_assets = []
-        
-        for asset in all_assets:
-            title = asset.get('title', '').lower()
-            description = asset.get('description', '').lower()
-            tags = asset.get('tags', '[]')
-            
-            if (query_lower in title or 
-                query_lower in description or 
-                query_lower in tags):
-                matching_assets.append(asset)
-        
-        return matching_assets
+        # Matching happens in SQLite instead of scanning every row in Python
+        return self.db.get_assets({**(filters or {}), 'search': query})
     
     def get_assets_by_category(self, category: str) -> List[Dict]:
         """Get assets by category"""
@@ -165,31 +169,18 @@ class AssetManager:
     
     def get_statistics(self) -> Dict:
         """Get comprehensive statistics"""
-        all_assets = self.db.get_assets()
         download_stats = self.db.get_download_stats()
+        totals = self.db.get_asset_totals()
         
-        # Asset statistics
+        # Asset statistics, aggregated by SQLite
         asset_stats = {
-            'total_assets': len(all_assets),
-            'by_type': {},
-            'by_category': {},
-            'by_site': {},
-            'free_assets': len([a for a in all_assets if a.get('is_free', True)])
+            'total_assets': totals['total_assets'],
+            'by_type': self.db.get_group_counts('asset_type'),
+            'by_category': self.db.get_group_counts('category'),
+            'by_site': self.db.get_group_counts('source_site'),
+            'free_assets': totals['free_assets']
         }
         
-        for asset in all_assets:
-            # By type
-            asset_type = asset.get('asset_type', 'unknown')
-            asset_stats['by_type'][asset_type] = asset_stats['by_type'].get(asset_type, 0) + 1
-            
-            # By category
-            category = asset.get('category', 'unknown')
-            asset_stats['by_category'][category] = asset_stats['by_category'].get(category, 0) + 1
-            
-            # By site
-            site = asset.get('source_site', 'unknown')
-            asset_stats['by_site'][site] = asset_stats['by_site'].get(site, 0) + 1
-        
         return {
             'assets': asset_stats,
             'downloads': download_stats
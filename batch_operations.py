@@ -3,15 +3,158 @@
 Batch operations for asset management
 """
 
+import os
+import re
+import logging
+import mmap
 import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple, Union
+from tqdm import tqdm
 import config
 from asset_manager import AssetManager
 
+try:
+    import fcntl  # FICLONE reflinks, Linux/Unix only
+except ImportError:
+    fcntl = None
+
+try:
+    from blake3 import blake3 as content_hasher  # SIMD/multithreaded, much faster on large files
+    HASH_ALGORITHM = 'blake3'
+except ImportError:
+    from hashlib import blake2b as content_hasher
+    HASH_ALGORITHM = 'blake2b'
+
+# File type mappings
+FILE_CATEGORIES = {
+    'images': {
+        'extensions': ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tga', '.svg'],
+        'subcategories': ['sprites', 'textures', 'ui', 'backgrounds']
+    },
+    'models': {
+        'extensions': ['.fbx', '.obj', '.dae', '.blend', '.3ds', '.max', '.ma', '.mb'],
+        'subcategories': ['characters', 'environments', 'props', 'vehicles']
+    },
+    'audio': {
+        'extensions': ['.mp3', '.wav', '.ogg', '.m4a', '.flac'],
+        'subcategories': ['music', 'sfx', 'voice']
+    },
+    'archives': {
+        'extensions': ['.zip', '.rar', '.7z', '.tar.gz'],
+        'subcategories': ['asset_packs', 'tools', 'source']
+    }
+}
+
+# Flat extension -> category lookup, one dict probe per file
+EXT_TO_CATEGORY = {
+    extension: category
+    for category, category_info in FILE_CATEGORIES.items()
+    for extension in category_info['extensions']
+}
+
+# Keywords for subcategorization
+SUBCATEGORY_KEYWORDS = {
+    'images': {
+        'sprites': ['sprite', 'character', 'player', 'enemy', 'npc'],
+        'textures': ['texture', 'material', 'surface', 'pattern'],
+        'ui': ['ui', 'button', 'icon', 'menu', 'interface', 'hud'],
+        'backgrounds': ['background', 'bg', 'landscape', 'sky', 'environment']
+    },
+    'models': {
+        'characters': ['character', 'player', 'enemy', 'npc', 'human', 'creature'],
+        'environments': ['building', 'house', 'tree', 'rock', 'terrain', 'landscape'],
+        'props': ['prop', 'furniture', 'object', 'item', 'tool'],
+        'vehicles': ['car', 'vehicle', 'ship', 'plane', 'bike', 'truck']
+    },
+    'audio': {
+        'music': ['music', 'song', 'track', 'theme', 'bgm'],
+        'sfx': ['sfx', 'sound', 'effect', 'noise', 'impact'],
+        'voice': ['voice', 'speech', 'talk', 'dialogue']
+    }
+}
+
+# One compiled alternation per subcategory, so each test is a single C-level scan
+SUBCATEGORY_PATTERNS = {
+    category: [(subcategory, re.compile('|'.join(map(re.escape, keywords))))
+               for subcategory, keywords in subcategories.items()]
+    for category, subcategories in SUBCATEGORY_KEYWORDS.items()
+}
+
+FICLONE = 0x40049409  # ioctl request for a copy-on-write clone (btrfs, xfs)
+
+def _fast_clone(src: Path, dst: Path):
+    """Place src at dst without copying bytes when the filesystem allows it"""
+    # Hardlink: same inode, nothing copied
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass  # Cross-device, unsupported or not permitted
+    
+    # Reflink: new inode sharing the same extents
+    if fcntl is not None:
+        with open(src, 'rb') as src_file, open(dst, 'xb') as dst_file:
+            try:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+                cloned = True
+            except OSError:
+                cloned = False  # Filesystem without reflink support
+        if cloned:
+            shutil.copystat(src, dst)
+            return
+    
+    shutil.copy2(src, dst)
+
+def _is_empty_dir(directory) -> bool:
+    """True if the directory has no entries; stops at the first one"""
+    with os.scandir(directory) as entries:
+        return next(entries, None) is None
+
+def _parallel_walk(root: Path, workers: int = 8) -> List[os.DirEntry]:
+    """List every file under root, scanning one directory per thread pool task"""
+    def scan(directory):
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+        except OSError as e:
+            print(f"❌ Error scanning {directory}: {e}")
+        return files, subdirs
+    
+    files, pending = scan(root)
+    
+    if len(pending) < 4:
+        # Small tree: thread overhead outweighs the overlap
+        while pending:
+            sub_files, sub_dirs = scan(pending.pop())
+            files.extend(sub_files)
+            pending.extend(sub_dirs)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scan, directory) for directory in pending}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub_files, sub_dirs = future.result()
+                    files.extend(sub_files)
+                    futures |= {executor.submit(scan, directory) for directory in sub_dirs}
+    
+    files.sort(key=lambda entry: entry.path)  # Deterministic order, like a sorted rglob
+    return files
+
 class BatchOperations:
     """Handle batch operations on assets"""
     
+    HEAD_HASH_BYTES = 4096
+    LARGE_FILE_BYTES = 64 * 1024 * 1024
+    
     def __init__(self):
         self.asset_manager = AssetManager()
         self.downloads_dir = Path(config.DOWNLOAD_DIR)
@@ -20,25 +163,7 @@ class BatchOperations:
         """Download multiple assets based on criteria"""
         print(f"🔍 Finding assets matching criteria: {criteria}")
         
-        # Get matching assets
-        assets = self.asset_manager.db.get_assets(criteria)
-        
-        if not assets:
-            print("❌ No assets found matching criteria")
-            return {'total': 0, 'successful': 0, 'failed': 0}
-        
-        print(f"📦 Found {len(assets)} matching assets")
-        
-        # Filter assets that have download URLs
-        downloadable_assets = [asset for asset in assets if asset.get('download_url')]
-        
-        if not downloadable_assets:
-            print("❌ No assets have download URLs")
-            return {'total': 0, 'successful': 0, 'failed': 0}
-        
-        print(f"⬇️  Downloading {len(downloadable_assets)} assets...")
-        
-        # Download assets
+        # download_assets reports matching/downloadable counts itself - no separate counting pass
         results = self.asset_manager.download_assets(criteria)
         
         print(f"✅ Batch download complete!")
@@ -56,58 +181,45 @@ class BatchOperations:
         
         print("📁 Organizing downloaded files...")
         
+        moved_count, error_count, _ = self._organize_entries(_parallel_walk(self.downloads_dir))
+        
+        print(f"\n📊 Organization complete!")
+        print(f"   Files moved: {moved_count}")
+        print(f"   Errors: {error_count}")
+        
+        return {'moved': moved_count, 'errors': error_count}
+    
+    def _organize_entries(self, entries: List[os.DirEntry]) -> Tuple[int, int, List[str]]:
+        """Place files into organized/<category>/<subcategory>, returning (moved, errors, new paths)"""
         moved_count = 0
         error_count = 0
+        created_paths = []
         
         # Create organized structure
         organized_dir = self.downloads_dir / "organized"
         organized_dir.mkdir(exist_ok=True)
         
-        # File type mappings
-        file_categories = {
-            'images': {
-                'extensions': ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tga', '.svg'],
-                'subcategories': ['sprites', 'textures', 'ui', 'backgrounds']
-            },
-            'models': {
-                'extensions': ['.fbx', '.obj', '.dae', '.blend', '.3ds', '.max', '.ma', '.mb'],
-                'subcategories': ['characters', 'environments', 'props', 'vehicles']
-            },
-            'audio': {
-                'extensions': ['.mp3', '.wav', '.ogg', '.m4a', '.flac'],
-                'subcategories': ['music', 'sfx', 'voice']
-            },
-            'archives': {
-                'extensions': ['.zip', '.rar', '.7z', '.tar.gz'],
-                'subcategories': ['asset_packs', 'tools', 'source']
-            }
-        }
-        
-        # Process all files
-        for file_path in self.downloads_dir.rglob('*'):
-            if (file_path.is_file() and 
-                not file_path.name.startswith('thumb_') and
-                'organized' not in str(file_path)):
+        # Process all files (progress bar instead of a print per file)
+        progress = tqdm(entries, desc="📁 Organizing", unit='file', mininterval=0.1)
+        for entry in progress:
+            if (not entry.name.startswith('thumb_') and
+                'organized' not in entry.path):
                 
+                file_path = Path(entry.path)
                 try:
-                    # Determine category
-                    file_ext = file_path.suffix.lower()
-                    category = None
-                    
-                    for cat_name, cat_info in file_categories.items():
-                        if file_ext in cat_info['extensions']:
-                            category = cat_name
-                            break
+                    # Lowercase name and directory once per file, shared by both lookups
+                    name_lower = entry.name.lower()
+                    path_lower = os.path.dirname(entry.path).lower()
                     
-                    if not category:
-                        category = 'other'
+                    # Determine category
+                    category = EXT_TO_CATEGORY.get(os.path.splitext(name_lower)[1], 'other')
                     
                     # Create category directory
                     category_dir = organized_dir / category
                     category_dir.mkdir(exist_ok=True)
                     
                     # Determine subcategory based on file name/path
-                    subcategory = self._determine_subcategory(file_path, category, file_categories)
+                    subcategory = self._determine_subcategory(name_lower, path_lower, category)
                     
                     if subcategory:
                         target_dir = category_dir / subcategory
@@ -119,51 +231,23 @@ class BatchOperations:
                     # Move file
                     target_path = target_dir / file_path.name
                     if not target_path.exists():
-                        shutil.copy2(file_path, target_path)
+                        _fast_clone(file_path, target_path)
+                        created_paths.append(str(target_path))
                         moved_count += 1
-                        print(f"📁 Moved: {file_path.name} -> {category}/{subcategory or ''}")
+                        progress.set_postfix(moved=moved_count, refresh=False)
                 
                 except Exception as e:
-                    print(f"❌ Error moving {file_path.name}: {e}")
+                    tqdm.write(f"❌ Error moving {file_path.name}: {e}")
                     error_count += 1
         
-        print(f"\n📊 Organization complete!")
-        print(f"   Files moved: {moved_count}")
-        print(f"   Errors: {error_count}")
-        
-        return {'moved': moved_count, 'errors': error_count}
+        return moved_count, error_count, created_paths
     
-    def _determine_subcategory(self, file_path: Path, category: str, file_categories: Dict) -> str:
-        """Determine subcategory based on file name and path"""
-        file_name_lower = file_path.name.lower()
-        path_lower = str(file_path.parent).lower()
-        
-        # Keywords for subcategorization
-        keywords = {
-            'images': {
-                'sprites': ['sprite', 'character', 'player', 'enemy', 'npc'],
-                'textures': ['texture', 'material', 'surface', 'pattern'],
-                'ui': ['ui', 'button', 'icon', 'menu', 'interface', 'hud'],
-                'backgrounds': ['background', 'bg', 'landscape', 'sky', 'environment']
-            },
-            'models': {
-                'characters': ['character', 'player', 'enemy', 'npc', 'human', 'creature'],
-                'environments': ['building', 'house', 'tree', 'rock', 'terrain', 'landscape'],
-                'props': ['prop', 'furniture', 'object', 'item', 'tool'],
-                'vehicles': ['car', 'vehicle', 'ship', 'plane', 'bike', 'truck']
-            },
-            'audio': {
-                'music': ['music', 'song', 'track', 'theme', 'bgm'],
-                'sfx': ['sfx', 'sound', 'effect', 'noise', 'impact'],
-                'voice': ['voice', 'speech', 'talk', 'dialogue']
-            }
-        }
-        
-        if category in keywords:
-            for subcategory, subcat_keywords in keywords[category].items():
-                for keyword in subcat_keywords:
-                    if keyword in file_name_lower or keyword in path_lower:
-                        return subcategory
+    def _determine_subcategory(self, name_lower: str, path_lower: str, category: str) -> str:
+        """Determine subcategory from the lowercased file name and directory path"""
+        # First subcategory with a keyword in the name or path wins
+        for subcategory, pattern in SUBCATEGORY_PATTERNS.get(category, []):
+            if pattern.search(name_lower) or pattern.search(path_lower):
+                return subcategory
         
         return None
     
@@ -174,54 +258,134 @@ class BatchOperations:
         
         print("🧹 Cleaning up downloads...")
         
+        removed_count, error_count, _ = self._remove_duplicates(_parallel_walk(self.downloads_dir))
+        self._remove_empty_dirs()
+        
+        print(f"\n📊 Cleanup complete!")
+        print(f"   Files removed: {removed_count}")
+        print(f"   Errors: {error_count}")
+        
+        return {'removed': removed_count, 'errors': error_count}
+    
+    def _remove_duplicates(self, entries: List[os.DirEntry]) -> Tuple[int, int, Set[str]]:
+        """Delete files whose content duplicates another file, returning (removed, errors, removed paths)"""
         removed_count = 0
         error_count = 0
+        removed_paths = set()
         
-        # Find and remove duplicate files
-        file_hashes = {}
-        duplicates = []
+        # Find duplicate files by content: group by size, then by a hash of the
+        # first 4 KiB, and only fully hash files that still collide
+        size_groups = defaultdict(list)
+        seen_inodes = set()
         
-        for file_path in self.downloads_dir.rglob('*'):
-            if file_path.is_file() and not file_path.name.startswith('thumb_'):
+        for entry in entries:
+            if not entry.name.startswith('thumb_'):
                 try:
-                    # Simple duplicate detection by size and name
-                    file_key = (file_path.name, file_path.stat().st_size)
-                    
-                    if file_key in file_hashes:
-                        duplicates.append(file_path)
-                        print(f"🔍 Found duplicate: {file_path.name}")
-                    else:
-                        file_hashes[file_key] = file_path
-                
+                    stat = entry.stat()
+                    inode_key = (stat.st_dev, stat.st_ino)
+                    if inode_key in seen_inodes:
+                        continue  # Hardlink (e.g. an organized/ view), takes no extra space
+                    seen_inodes.add(inode_key)
+                    size_groups[stat.st_size].append(Path(entry.path))
                 except Exception as e:
-                    print(f"❌ Error checking {file_path.name}: {e}")
+                    print(f"❌ Error checking {entry.name}: {e}")
                     error_count += 1
         
+        # Hashes from earlier runs, so unchanged files are not read again
+        hash_db = self.asset_manager.db.get_file_hashes(HASH_ALGORITHM)
+        updated_hashes = []
+        duplicates = []
+        
+        candidate_groups = [paths for size, paths in size_groups.items() if size > 0 and len(paths) > 1]
+        
+        # Hashing releases the GIL, so files are hashed in parallel across all groups
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            def split_by_hash(groups: List[List[Path]], hash_func, desc: str) -> List[List[Path]]:
+                nonlocal error_count
+                paths = [file_path for group in groups for file_path in group]
+                group_ids = [group_id for group_id, group in enumerate(groups) for _ in group]
+                
+                def safe_hash(file_path: Path):
+                    try:
+                        return hash_func(file_path), None
+                    except Exception as e:
+                        return None, e
+                
+                buckets = defaultdict(list)
+                results = tqdm(executor.map(safe_hash, paths), total=len(paths), desc=desc, unit='file', mininterval=0.1)
+                for group_id, file_path, (digest, error) in zip(group_ids, paths, results):
+                    if error is not None:
+                        tqdm.write(f"❌ Error checking {file_path.name}: {error}")
+                        error_count += 1
+                    else:
+                        buckets[(group_id, digest)].append(file_path)
+                
+                return [bucket for bucket in buckets.values() if len(bucket) > 1]
+            
+            same_head = split_by_hash(candidate_groups, self._hash_file_head, "🔍 Hashing heads")
+            same_content = split_by_hash(same_head, lambda p: self._hash_file(p, hash_db, updated_hashes),
+                                         "🔍 Hashing files")
+        
+        for same_files in same_content:
+            # Keep the first path, remove the rest
+            same_files.sort()
+            duplicates.extend(same_files[1:])
+        
         # Remove duplicates
         for duplicate_path in duplicates:
             try:
                 duplicate_path.unlink()
+                removed_paths.add(str(duplicate_path))
                 removed_count += 1
-                print(f"🗑️  Removed duplicate: {duplicate_path.name}")
             except Exception as e:
                 print(f"❌ Error removing {duplicate_path.name}: {e}")
                 error_count += 1
         
-        # Remove empty directories
-        for dir_path in self.downloads_dir.rglob('*'):
-            if dir_path.is_dir():
-                try:
-                    if not any(dir_path.iterdir()):
-                        dir_path.rmdir()
-                        print(f"📁 Removed empty directory: {dir_path.name}")
-                except Exception:
-                    pass  # Directory not empty or other error
+        if updated_hashes:
+            self.asset_manager.db.save_file_hashes(updated_hashes, HASH_ALGORITHM)
         
-        print(f"\n📊 Cleanup complete!")
-        print(f"   Files removed: {removed_count}")
-        print(f"   Errors: {error_count}")
-        
-        return {'removed': removed_count, 'errors': error_count}
+        return removed_count, error_count, removed_paths
+    
+    def _remove_empty_dirs(self):
+        """Remove empty directories left under downloads/"""
+        # Bottom-up, so parents emptied by removing their children go in the same pass
+        for dir_path, _, _ in os.walk(self.downloads_dir, topdown=False):
+            if dir_path == os.fspath(self.downloads_dir):
+                continue
+            try:
+                if _is_empty_dir(dir_path):
+                    os.rmdir(dir_path)
+                    print(f"📁 Removed empty directory: {os.path.basename(dir_path)}")
+            except Exception:
+                pass  # Directory not empty or other error
+    
+    def _hash_file_head(self, file_path: Path) -> bytes:
+        """Hash only the first few KiB of a file, to cheaply split same-size files"""
+        with open(file_path, 'rb') as f:
+            return content_hasher(f.read(self.HEAD_HASH_BYTES)).digest()
+    
+    def _hash_file(self, file_path: Path, hash_db: Dict, updated_hashes: List) -> bytes:
+        """Full content hash, reused from the hash db while the inode's size and mtime are unchanged"""
+        stat = file_path.stat()
+        inode_key = (stat.st_dev, stat.st_ino)
+        cached = hash_db.get(inode_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        if HASH_ALGORITHM == 'blake3':
+            # Native mmap hashing without the GIL; only big files get blake3's own thread pool
+            max_threads = content_hasher.AUTO if stat.st_size >= self.LARGE_FILE_BYTES else 1
+            hasher = content_hasher(max_threads=max_threads)
+            hasher.update_mmap(file_path)
+        else:
+            hasher = content_hasher()
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)  # hashlib releases the GIL for large buffers
+        
+        digest = hasher.digest()
+        hash_db[inode_key] = (stat.st_mtime_ns, stat.st_size, digest)
+        updated_hashes.append((*inode_key, stat.st_mtime_ns, stat.st_size, digest))
+        return digest
     
     def batch_generate_metadata(self) -> Dict:
         """Generate metadata files for all assets"""
@@ -230,50 +394,97 @@ class BatchOperations:
         
         print("📝 Generating metadata files...")
         
+        entries = _parallel_walk(self.downloads_dir)
+        existing_paths = {entry.path for entry in entries}  # Answers meta_path.exists() without a syscall
+        generated_count, error_count = self._write_metadata_files(entries, existing_paths)
+        
+        print(f"\n📊 Metadata generation complete!")
+        print(f"   Files generated: {generated_count}")
+        print(f"   Errors: {error_count}")
+        
+        return {'generated': generated_count, 'errors': error_count}
+    
+    def _write_metadata_files(self, files: List[Union[os.DirEntry, Path]], existing_paths: Set[str]) -> Tuple[int, int]:
+        """Write a .meta file next to every file that lacks one, returning (generated, errors)"""
         generated_count = 0
         error_count = 0
         
-        for file_path in self.downloads_dir.rglob('*'):
-            if (file_path.is_file() and 
-                not file_path.name.startswith('thumb_') and
-                not file_path.name.endswith('.meta')):
+        # Collect files that still need a .meta file
+        pending = []
+        for file in sorted(files, key=os.fspath):
+            if (not file.name.startswith('thumb_') and
+                not file.name.endswith('.meta')):
                 
+                meta_path = os.fspath(file) + '.meta'
+                if meta_path not in existing_paths:
+                    pending.append((file, meta_path))
+        
+        def write_metadata(file: Union[os.DirEntry, Path], meta_path: str):
+            metadata = self._generate_file_metadata(file)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                f.write(metadata)
+        
+        # Small writes are latency-bound, so keep many of them in flight
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [executor.submit(write_metadata, file, meta_path) for file, meta_path in pending]
+            
+            progress = tqdm(zip(pending, futures), total=len(pending), desc="📝 Metadata", unit='file', mininterval=0.1)
+            for (file, _), future in progress:
                 try:
-                    # Create metadata file
-                    meta_path = file_path.with_suffix(file_path.suffix + '.meta')
-                    
-                    if not meta_path.exists():
-                        metadata = self._generate_file_metadata(file_path)
-                        
-                        with open(meta_path, 'w', encoding='utf-8') as f:
-                            f.write(metadata)
-                        
-                        generated_count += 1
-                        print(f"📝 Generated metadata: {file_path.name}.meta")
+                    future.result()
+                    generated_count += 1
                 
                 except Exception as e:
-                    print(f"❌ Error generating metadata for {file_path.name}: {e}")
+                    tqdm.write(f"❌ Error generating metadata for {file.name}: {e}")
                     error_count += 1
         
-        print(f"\n📊 Metadata generation complete!")
+        return generated_count, error_count
+    
+    def batch_full_maintenance(self) -> Dict:
+        """Cleanup, organize and generate metadata from a single directory walk"""
+        if not self.downloads_dir.exists():
+            print("❌ Downloads directory not found")
+            return {'removed': 0, 'moved': 0, 'generated': 0, 'errors': 0}
+        
+        print("🚀 Running full maintenance...")
+        entries = _parallel_walk(self.downloads_dir)
+        
+        # Dedup first, so duplicates are never organized or given metadata
+        removed_count, cleanup_errors, removed_paths = self._remove_duplicates(entries)
+        self._remove_empty_dirs()
+        entries = [entry for entry in entries if entry.path not in removed_paths]
+        
+        moved_count, organize_errors, created_paths = self._organize_entries(entries)
+        
+        # Metadata for the surviving files (stat already cached on their entries) plus the new organized copies
+        existing_paths = {entry.path for entry in entries}
+        generated_count, metadata_errors = self._write_metadata_files(
+            entries + [Path(path) for path in created_paths], existing_paths)
+        
+        error_count = cleanup_errors + organize_errors + metadata_errors
+        
+        print(f"\n📊 Full maintenance complete!")
+        print(f"   Files removed: {removed_count}")
+        print(f"   Files moved: {moved_count}")
         print(f"   Files generated: {generated_count}")
         print(f"   Errors: {error_count}")
         
-        return {'generated': generated_count, 'errors': error_count}
+        return {'removed': removed_count, 'moved': moved_count, 'generated': generated_count, 'errors': error_count}
     
-    def _generate_file_metadata(self, file_path: Path) -> str:
-        """Generate metadata content for a file"""
+    def _generate_file_metadata(self, file: Union[os.DirEntry, Path]) -> str:
+        """Generate metadata content for a file (DirEntry stats come from the walk's cache)"""
         try:
-            stat = file_path.stat()
+            stat = file.stat()
             size_mb = stat.st_size / (1024 * 1024)
+            suffix = os.path.splitext(file.name)[1]
             
             metadata = f"""# Asset Metadata
-File: {file_path.name}
+File: {file.name}
 Size: {size_mb:.2f} MB
-Type: {file_path.suffix.upper()[1:] if file_path.suffix else 'Unknown'}
+Type: {suffix.upper()[1:] if suffix else 'Unknown'}
 Created: {stat.st_ctime}
 Modified: {stat.st_mtime}
-Path: {file_path}
+Path: {os.fspath(file)}
 
 # Tags
 # Add your custom tags here
@@ -288,6 +499,7 @@ Path: {file_path}
 
 def main():
     """Main function"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')  # Show downloader INFO messages
     batch_ops = BatchOperations()
     
     print("Batch Operations Manager")
@@ -298,7 +510,7 @@ def main():
     print("4. Organize all files")
     print("5. Cleanup duplicates")
     print("6. Generate metadata")
-    print("7. Full maintenance (organize + cleanup + metadata)")
+    print("7. Full maintenance (cleanup + organize + metadata)")
     
     choice = input("\nSelect option (1-7): ").strip()
     
@@ -324,11 +536,7 @@ def main():
         batch_ops.batch_generate_metadata()
     
     elif choice == "7":
-        print("🚀 Running full maintenance...")
-        batch_ops.batch_organize_files()
-        batch_ops.batch_cleanup()
-        batch_ops.batch_generate_metadata()
-        print("✅ Full maintenance complete!")
+        batch_ops.batch_full_maintenance()
     
     else:
         print("Invalid choice!")
@@ -12,10 +12,9 @@ DOWNLOAD_DIR.mkdir(exist_ok=True)
 
 # Download settings - Güvenli ve etik scraping için optimize edildi
 MAX_CONCURRENT_DOWNLOADS = 3  # Daha düşük eş zamanlı indirme
-CHUNK_SIZE = 8192
+CHUNK_SIZE = 1 << 20  # 1 MiB; küçük chunk'lar indirme hızını düşürür
 REQUEST_TIMEOUT = 30
 RETRY_ATTEMPTS = 2  # Daha az deneme
-DELAY_BETWEEN_REQUESTS = random.uniform(3, 7)  # 3-7 saniye arası rastgele gecikme
 
 # Gelişmiş Rate limiting - Site bazında özelleştirilebilir
 RATE_LIMITS = {
@@ -55,8 +54,8 @@ RATE_LIMITS = {
 MAX_REQUESTS_PER_MINUTE = RATE_LIMITS['default']['requests_per_minute']
 REQUESTS_PER_SITE_PER_HOUR = RATE_LIMITS['default']['requests_per_hour']
 
-# Gelişmiş User Agent rotation - Gerçek tarayıcı imzaları
-USER_AGENTS = [
+# Gelişmiş User Agent rotation - Gerçek tarayıcı imzaları (tuple: sabit liste)
+USER_AGENTS = (
     # Chrome - Windows
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -74,14 +73,27 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0",
     # Chrome - Linux
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-]
+)
 
 # User-Agent rotation ayarları
 USER_AGENT_ROTATION_CHANCE = 0.15  # %15 ihtimalle değiştir (daha sık)
 USER_AGENT_CHANGE_PER_DOMAIN = True  # Domain başına farklı UA
 
-# Varsayılan User Agent
-USER_AGENT = random.choice(USER_AGENTS)
+# Paylaşılan RNG - User-Agent her çağrıda yeniden seçilir (import anında bir kez değil)
+_rng = random.Random()
+_domain_ua_cache = {}
+
+def pick_user_agent() -> str:
+    """Rastgele bir User-Agent seç"""
+    return _rng.choice(USER_AGENTS)
+
+def user_agent_for_domain(domain: str) -> str:
+    """Domain başına tutarlı User-Agent (USER_AGENT_CHANGE_PER_DOMAIN kapalıysa her seferinde yeni)"""
+    if not USER_AGENT_CHANGE_PER_DOMAIN:
+        return pick_user_agent()
+    if domain not in _domain_ua_cache:
+        _domain_ua_cache[domain] = pick_user_agent()
+    return _domain_ua_cache[domain]
 
 # Proxy ayarları - GÜVENLİK NEDENİYLE DEVRE DIŞI
 USE_PROXY = False  # Proxy kullanımı kapatıldı
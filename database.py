@@ -1,20 +1,56 @@
 import sqlite3
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 import config
 
+def _unicode_lower(value):
+    """str.lower for SQL - SQLite's own lower()/LIKE only fold ASCII"""
+    return value.lower() if isinstance(value, str) else value
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.DATABASE_PATH
+        self._tls = threading.local()  # One connection per thread, reused across calls
         self.init_database()
     
+    def __getstate__(self):
+        """Pickle only the path - connections are per process/thread (DataLoader workers)"""
+        state = self.__dict__.copy()
+        state.pop('_tls', None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tls = threading.local()
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it with the performance pragmas on first use"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        # A larger statement cache keeps every query of this class compiled
+        conn = sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT, cached_statements=256)
+        conn.execute('PRAGMA synchronous=NORMAL')  # Safe under WAL: fsync at checkpoints, not on every commit
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
+        conn.execute('PRAGMA cache_size=-64000')  # ~64 MB page cache
+        conn.create_function('unicode_lower', 1, _unicode_lower, deterministic=True)
+        self._tls.conn = conn
+        return conn
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
             
+            # Write-ahead logging: readers don't block the writer, commits are appends (persists in the file)
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Assets table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS assets (
@@ -68,89 +104,248 @@ class DatabaseManager:
                 )
             ''')
             
+            # Tags shredded one row per (asset, tag), so tag filters are index lookups
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'asset_tags'")
+            backfill_tags = cursor.fetchone() is None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS asset_tags (
+                    asset_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (asset_id, tag),
+                    FOREIGN KEY (asset_id) REFERENCES assets (id)
+                )
+            ''')
+            if backfill_tags:
+                try:
+                    # Existing databases: shred the JSON tags column once
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO asset_tags (asset_id, tag)
+                        SELECT assets.id, json_each.value FROM assets, json_each(assets.tags)
+                        WHERE json_valid(assets.tags) AND json_each.value IS NOT NULL
+                    ''')
+                except sqlite3.OperationalError as e:
+                    print(f"Could not backfill asset tags: {e}")  # SQLite without JSON1
+            
+            # Content hashes for duplicate detection, keyed by inode so renames keep their entry
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    dev INTEGER NOT NULL,
+                    ino INTEGER NOT NULL,
+                    mtime INTEGER NOT NULL, -- st_mtime_ns
+                    size INTEGER NOT NULL,
+                    algorithm TEXT NOT NULL, -- 'blake3' or 'blake2b'
+                    hash BLOB NOT NULL,
+                    PRIMARY KEY (dev, ino)
+                )
+            ''')
+            
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_site ON assets(source_site)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(asset_type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_category ON assets(category)')
+            # get_assets' common filters (type, site + type) with ORDER BY created_at DESC: one range scan, no sort
+            cursor.execute('DROP INDEX IF EXISTS idx_assets_filter')  # Superseded: needed site first and still sorted
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_type_created ON assets(asset_type, created_at DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_site_type_created ON assets(source_site, asset_type, created_at DESC)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_downloads_status ON downloads(download_status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_asset_tags_tag ON asset_tags(tag)')
             
             conn.commit()
     
-    def add_asset(self, asset_data: Dict) -> int:
+    ASSET_INSERT_SQL = '''
+        INSERT OR REPLACE INTO assets 
+        (title, description, url, source_site, asset_type, category, tags, 
+         file_size, file_format, preview_url, download_url, is_free, license_info, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    _iso_cache = (0, '')  # (unix second, ISO string), swapped atomically
+    
+    @classmethod
+    def _now_iso(cls) -> str:
+        """Current local time as an ISO string, formatted at most once per second"""
+        now = int(time.time())
+        cached_second, cached_iso = cls._iso_cache
+        if cached_second == now:
+            return cached_iso
+        
+        iso = datetime.fromtimestamp(now).isoformat()
+        cls._iso_cache = (now, iso)
+        return iso
+    
+    @classmethod
+    def _asset_row(cls, asset_data: Dict) -> Tuple:
+        """Map an asset dict to ASSET_INSERT_SQL parameters"""
+        return (
+            asset_data.get('title'),
+            asset_data.get('description'),
+            asset_data.get('url'),
+            asset_data.get('source_site'),
+            asset_data.get('asset_type'),
+            asset_data.get('category'),
+            json.dumps(asset_data.get('tags', [])),
+            asset_data.get('file_size'),
+            asset_data.get('file_format'),
+            asset_data.get('preview_url'),
+            asset_data.get('download_url'),
+            asset_data.get('is_free', True),
+            asset_data.get('license_info'),
+            cls._now_iso()
+        )
+    
+    def add_asset(self, asset_data: Dict) -> Optional[int]:
         """Add a new asset to the database"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        return self.add_assets_bulk([asset_data])[0]
+    
+    def add_assets_bulk(self, assets: List[Dict]) -> List[Optional[int]]:
+        """Add many assets in a single transaction, returning each row id (None if it failed)"""
+        asset_ids = []
+        with self._conn() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO assets 
-                (title, description, url, source_site, asset_type, category, tags, 
-                 file_size, file_format, preview_url, download_url, is_free, license_info, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                asset_data.get('title'),
-                asset_data.get('description'),
-                asset_data.get('url'),
-                asset_data.get('source_site'),
-                asset_data.get('asset_type'),
-                asset_data.get('category'),
-                json.dumps(asset_data.get('tags', [])),
-                asset_data.get('file_size'),
-                asset_data.get('file_format'),
-                asset_data.get('preview_url'),
-                asset_data.get('download_url'),
-                asset_data.get('is_free', True),
-                asset_data.get('license_info'),
-                datetime.now().isoformat()
-            ))
-            
-            return cursor.lastrowid
-    
-    def get_assets(self, filters: Dict = None) -> List[Dict]:
+            for asset_data in assets:
+                try:
+                    # REPLACE gives the row a new id, so remember the old one to move its tags
+                    cursor.execute('SELECT id FROM assets WHERE url = ?', (asset_data.get('url'),))
+                    replaced = cursor.fetchone()
+                    
+                    cursor.execute(self.ASSET_INSERT_SQL, self._asset_row(asset_data))
+                    asset_id = cursor.lastrowid
+                    
+                    if replaced:
+                        cursor.execute('DELETE FROM asset_tags WHERE asset_id = ?', replaced)
+                    cursor.executemany('INSERT OR IGNORE INTO asset_tags (asset_id, tag) VALUES (?, ?)',
+                                       ((asset_id, str(tag)) for tag in asset_data.get('tags') or []))
+                    
+                    asset_ids.append(asset_id)
+                except sqlite3.Error as e:
+                    print(f"Error saving asset {asset_data.get('title', 'Unknown')}: {e}")
+                    asset_ids.append(None)
+        
+        return asset_ids
+    
+    def get_assets(self, filters: Dict = None, limit: int = None) -> List[Dict]:
         """Get assets with optional filters"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
-            conn.row_factory = sqlite3.Row
+        return list(self.iter_assets(filters, limit))
+    
+    def iter_assets(self, filters: Dict = None, limit: int = None) -> Iterator[Dict]:
+        """Yield assets matching the filters one by one, without materializing the result set"""
+        cursor = self._conn().cursor()
+        cursor.row_factory = sqlite3.Row  # Per cursor, the connection is shared
+        
+        query = "SELECT * FROM assets WHERE 1=1"
+        params = []
+        
+        if filters:
+            if 'source_site' in filters:
+                query += " AND source_site = ?"
+                params.append(filters['source_site'])
+            
+            if 'asset_type' in filters:
+                query += " AND asset_type = ?"
+                params.append(filters['asset_type'])
+            
+            if 'category' in filters:
+                query += " AND category = ?"
+                params.append(filters['category'])
+            
+            if 'is_free' in filters:
+                query += " AND is_free = ?"
+                params.append(filters['is_free'])
+            
+            if 'tag' in filters:
+                query += " AND id IN (SELECT asset_id FROM asset_tags WHERE tag = ?)"
+                params.append(filters['tag'])
+            
+            if filters.get('search'):
+                # Case-insensitive substring match; escape LIKE wildcards in the user query
+                search = filters['search'].lower()
+                escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                pattern = f"%{escaped}%"
+                if search.isascii():
+                    # Built-in LIKE already folds ASCII case
+                    query += (" AND (title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\'"
+                              " OR tags LIKE ? ESCAPE '\\')")
+                else:
+                    # LIKE leaves non-ASCII case alone, so lower both sides in Python ('ça' finds 'Ça')
+                    query += (" AND (unicode_lower(title) LIKE ? ESCAPE '\\'"
+                              " OR unicode_lower(description) LIKE ? ESCAPE '\\'"
+                              " OR unicode_lower(tags) LIKE ? ESCAPE '\\')")
+                params.extend([pattern, pattern, pattern])
+        
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        cursor.execute(query, params)
+        for row in cursor:
+            yield dict(row)
+    
+    def get_group_counts(self, column: str) -> Dict:
+        """Count assets per distinct value of a column"""
+        if column not in ('source_site', 'asset_type', 'category', 'is_free'):
+            raise ValueError(f"Unsupported group column: {column}")
+        
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {column}, COUNT(*) FROM assets GROUP BY {column} ORDER BY COUNT(*) DESC")
+            return dict(cursor.fetchall())
+    
+    def get_asset_totals(self) -> Dict:
+        """Get total and free asset counts"""
+        with self._conn() as conn:
             cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_assets,
+                    COALESCE(SUM(CASE WHEN is_free THEN 1 ELSE 0 END), 0) as free_assets
+                FROM assets
+            ''')
             
-            query = "SELECT * FROM assets WHERE 1=1"
-            params = []
-            
-            if filters:
-                if 'source_site' in filters:
-                    query += " AND source_site = ?"
-                    params.append(filters['source_site'])
-                
-                if 'asset_type' in filters:
-                    query += " AND asset_type = ?"
-                    params.append(filters['asset_type'])
-                
-                if 'category' in filters:
-                    query += " AND category = ?"
-                    params.append(filters['category'])
-                
-                if 'is_free' in filters:
-                    query += " AND is_free = ?"
-                    params.append(filters['is_free'])
-            
-            query += " ORDER BY created_at DESC"
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            result = cursor.fetchone()
+            return {
+                'total_assets': result[0],
+                'free_assets': result[1]
+            }
+    
+    def get_asset_signature(self, asset_type: str = None) -> Tuple[int, int]:
+        """(row count, max id) of the assets - changes whenever rows are added, replaced or removed"""
+        with self._conn() as conn:
+            if asset_type is None:
+                row = conn.execute('SELECT COUNT(*), COALESCE(MAX(id), 0) FROM assets').fetchone()
+            else:
+                row = conn.execute('SELECT COUNT(*), COALESCE(MAX(id), 0) FROM assets WHERE asset_type = ?',
+                                   (asset_type,)).fetchone()
+            return row[0], row[1]
     
     def add_download(self, asset_id: int, local_path: str) -> int:
         """Add a new download record"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        return self.add_downloads_bulk([(asset_id, local_path)])[0]
+    
+    def add_downloads_bulk(self, rows: List[Tuple[int, str]]) -> List[Optional[int]]:
+        """Add many (asset_id, local_path) download records in one transaction, returning their ids"""
+        download_ids = []
+        started_at = self._now_iso()
+        with self._conn() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO downloads (asset_id, local_path, download_started_at)
-                VALUES (?, ?, ?)
-            ''', (asset_id, local_path, datetime.now().isoformat()))
-            
-            return cursor.lastrowid
+            for asset_id, local_path in rows:
+                try:
+                    cursor.execute('''
+                        INSERT INTO downloads (asset_id, local_path, download_started_at)
+                        VALUES (?, ?, ?)
+                    ''', (asset_id, local_path, started_at))
+                    download_ids.append(cursor.lastrowid)
+                except sqlite3.Error as e:
+                    print(f"Error adding download for {local_path}: {e}")
+                    download_ids.append(None)
+        
+        return download_ids
     
     def update_download_progress(self, download_id: int, progress: float, downloaded_size: int = None):
         """Update download progress"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
             
             if downloaded_size is not None:
@@ -168,45 +363,59 @@ class DatabaseManager:
     
     def complete_download(self, download_id: int, success: bool = True, error_message: str = None):
         """Mark download as completed or failed"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
-            cursor = conn.cursor()
-            
-            status = 'completed' if success else 'failed'
-            cursor.execute('''
+        self.complete_downloads_bulk([(download_id, success, error_message)])
+    
+    def complete_downloads_bulk(self, rows: List[Tuple[int, bool, Optional[str]]]):
+        """Mark many (download_id, success, error_message) downloads finished in one transaction"""
+        if not rows:
+            return
+        completed_at = self._now_iso()
+        with self._conn() as conn:
+            conn.executemany('''
                 UPDATE downloads 
                 SET download_status = ?, download_completed_at = ?, error_message = ?
                 WHERE id = ?
-            ''', (status, datetime.now().isoformat(), error_message, download_id))
+            ''', [('completed' if success else 'failed', completed_at, error_message, download_id)
+                  for download_id, success, error_message in rows])
     
     def update_site_status(self, site_name: str, status: str, assets_found: int = None, error_message: str = None):
         """Update site scraping status"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
                 INSERT OR REPLACE INTO sites 
                 (site_name, last_scraped_at, total_assets_found, scraping_status, error_message)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (site_name, datetime.now().isoformat(), assets_found, status, error_message))
+            ''', (site_name, self._now_iso(), assets_found, status, error_message))
+    
+    def get_file_hashes(self, algorithm: str) -> Dict[Tuple[int, int], Tuple[int, int, bytes]]:
+        """Get cached file hashes as {(dev, ino): (mtime_ns, size, hash)}"""
+        with self._conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT dev, ino, mtime, size, hash FROM file_hashes WHERE algorithm = ?', (algorithm,))
+            return {(dev, ino): (mtime, size, digest) for dev, ino, mtime, size, digest in cursor.fetchall()}
+    
+    def save_file_hashes(self, rows: List[Tuple], algorithm: str):
+        """Store (dev, ino, mtime_ns, size, hash) rows in a single transaction"""
+        with self._conn() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO file_hashes (dev, ino, mtime, size, algorithm, hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', ((dev, ino, mtime, size, algorithm, digest) for dev, ino, mtime, size, digest in rows))
     
     def get_download_stats(self) -> Dict:
         """Get download statistics"""
-        with sqlite3.connect(self.db_path, timeout=config.DB_TIMEOUT) as conn:
+        with self._conn() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_downloads,
-                    SUM(CASE WHEN download_status = 'completed' THEN 1 ELSE 0 END) as completed,
-                    SUM(CASE WHEN download_status = 'failed' THEN 1 ELSE 0 END) as failed,
-                    SUM(CASE WHEN download_status = 'downloading' THEN 1 ELSE 0 END) as in_progress
-                FROM downloads
-            ''')
+            # GROUP BY on the indexed column is answered from idx_downloads_status alone
+            cursor.execute('SELECT download_status, COUNT(*) FROM downloads GROUP BY download_status')
+            status_counts = dict(cursor.fetchall())
             
-            result = cursor.fetchone()
             return {
-                'total_downloads': result[0],
-                'completed': result[1],
-                'failed': result[2],
-                'in_progress': result[3]
+                'total_downloads': sum(status_counts.values()),
+                'completed': status_counts.get('completed', 0),
+                'failed': status_counts.get('failed', 0),
+                'in_progress': status_counts.get('downloading', 0)
             }
@@ -1,41 +1,161 @@
 import os
+import re
+import sys
+import time
+import logging
+import functools
 import requests
 import asyncio
 import aiohttp
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 from tqdm import tqdm
 import config
 from database import DatabaseManager
 
+# %-style args are only formatted if a handler actually emits the record
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401 - lets urllib3 and aiohttp decode 'br' responses
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Stream chunk size - config.CHUNK_SIZE if set, 1 MiB otherwise (throughput plateaus above ~100 KiB)
+_DOWNLOAD_CHUNK = config.CHUNK_SIZE or 1 << 20
+
+# Bounds for the per-host adaptive chunk size of the async path
+_MIN_ADAPTIVE_CHUNK = 64 * 1024
+_MAX_ADAPTIVE_CHUNK = 4 * 1024 * 1024
+
+# Expected leading bytes per extension (3D/text formats aren't checked)
+_EXT_MAGIC = {
+    '.zip': b'PK',
+    '.jpg': b'\xff\xd8\xff',
+    '.jpeg': b'\xff\xd8\xff',
+    '.png': b'\x89PNG',
+    '.gif': b'GIF',
+}
+
+# '<html' / '<!doctype' in any case - matched on the raw bytes, no lowercased copy
+_HTML_SNIFF = re.compile(rb'<(?:html|!doctype)', re.IGNORECASE)
+
+# Characters that aren't allowed in filenames -> '_' (single translate pass)
+_FN_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
+@functools.lru_cache(maxsize=256)
+def _category_dir(download_dir: Path, site: str, category: str) -> Path:
+    """downloads/site_name/category/ - shared across assets of the same category"""
+    return download_dir / site / category
+
+
+# Downloads bigger than this stream past the page cache (written once, never re-read here)
+_LARGE_DOWNLOAD_BYTES = 64 * 1024 * 1024
+
+
+def _url_extension(download_url: str) -> str:
+    """Suffix of the URL path's last segment; '.zip' if the path has no dot"""
+    url_path = urlparse(download_url).path  # Handles //cdn... (protocol-relative) and ;params
+    if '.' not in url_path:
+        return '.zip'  # Default to .zip for archives
+    name = url_path.rstrip('/').rpartition('/')[2]  # '/pack.zip/' names pack.zip, like Path(...).suffix
+    dot = name.rfind('.')
+    return name[dot:] if 0 < dot < len(name) - 1 else ''
+
+
+def _write_all(fd: int, data, release_upto: int = 0) -> None:
+    """os.write until the whole buffer is on disk (handles short writes)"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+    if release_upto:
+        _release_cache(fd, release_upto)
+
+
+def _release_cache(fd: int, upto: int) -> None:
+    """Flush the first `upto` bytes and drop them from the page cache"""
+    if hasattr(os, 'posix_fadvise'):
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, upto, os.POSIX_FADV_DONTNEED)
+
+
+# One ClientSession/TCP pool per event loop, shared by every AssetDownloader on it
+_shared_session = None
+_shared_session_loop = None
+
+
+def _get_shared_session() -> 'aiohttp.ClientSession':
+    """Return the loop's shared session, creating it on first use (no await, so no lock needed)"""
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        # Pooled keep-alive connector with DNS cache shared by all downloads
+        connector = aiohttp.TCPConnector(
+            limit=config.MAX_CONCURRENT_DOWNLOADS,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _shared_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT),
+            headers={'User-Agent': config.pick_user_agent(), 'Accept-Encoding': ACCEPT_ENCODING}
+        )
+        _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session():
+    """Close the shared session - call before the event loop that owns it shuts down"""
+    global _shared_session, _shared_session_loop
+    session, _shared_session, _shared_session_loop = _shared_session, None, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
 class AssetDownloader:
     """Handles downloading of assets with progress tracking and resume capability"""
     
+    # Progress is written to the DB at most every 4 MiB or once per second
+    PROGRESS_FLUSH_BYTES = 4 * 1024 * 1024
+    PROGRESS_FLUSH_SECONDS = 1.0
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
         self.download_dir = config.DOWNLOAD_DIR
         self.session = None
+        self._known_dirs = set()  # Directories already created by this downloader
+        self._io_executor = None  # Disk I/O pool for the async path (set up in __aenter__)
+        self._host_stats = {}  # host -> (EWMA seconds per byte, EWMA time to first byte)
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT),
-            headers={'User-Agent': config.USER_AGENT}
-        )
+        # Reuse the process-wide pool so keep-alive connections survive across downloaders
+        self.session = _get_shared_session()
+        # Blocking file work runs here so it never stalls other in-flight downloads
+        self._io_executor = ThreadPoolExecutor(max_workers=min(32, max(1, config.MAX_CONCURRENT_DOWNLOADS)),
+                                               thread_name_prefix='download-io')
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        # The shared session stays open for other downloaders (see close_shared_session)
+        self.session = None
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
     
     def download_asset_sync(self, asset_data: Dict) -> bool:
         """Synchronous download method with HTML detection"""
         try:
             download_url = asset_data.get('download_url')
             if not download_url:
-                print(f"No download URL for asset: {asset_data['title']}")
+                logger.warning("No download URL for asset: %s", asset_data['title'])
                 return False
 
             # Create local file path
@@ -44,131 +164,310 @@ class AssetDownloader:
             # Add download record to database
             download_id = self.db.add_download(asset_data['id'], str(local_path))
 
-            # Check if file already exists and is valid
-            if local_path.exists():
+            # Check if file already exists and is valid (single stat on the miss path)
+            try:
+                os.stat(local_path)
+            except FileNotFoundError:
+                pass
+            else:
                 if self._is_valid_file(local_path):
-                    print(f"Valid file already exists: {local_path}")
+                    logger.info("Valid file already exists: %s", local_path)
                     self.db.complete_download(download_id, True)
                     return True
                 else:
-                    print(f"Invalid file exists, re-downloading: {local_path}")
+                    logger.warning("Invalid file exists, re-downloading: %s", local_path)
                     local_path.unlink()  # Delete invalid file
 
             # Create directory if it doesn't exist
-            local_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(local_path.parent)
 
             # Download the file with better headers
             headers = {
-                'User-Agent': config.USER_AGENT,
+                'User-Agent': config.user_agent_for_domain(urlparse(download_url).netloc),
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
+                'Accept-Encoding': ACCEPT_ENCODING,
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
             }
 
-            response = requests.get(
-                download_url,
-                stream=True,
-                headers=headers,
-                timeout=config.REQUEST_TIMEOUT,
-                allow_redirects=True
-            )
+            # Resume an interrupted download from its .part file
+            part_path = self._part_path(local_path)
+            resume_from = self._partial_size(part_path)
+            if resume_from:
+                headers['Range'] = f'bytes={resume_from}-'
+                headers['Accept-Encoding'] = 'identity'  # Offsets must match the bytes on disk
+
+            request_kwargs = dict(stream=True, timeout=config.REQUEST_TIMEOUT, allow_redirects=True)
+            response = requests.get(download_url, headers=headers, **request_kwargs)
+            if response.status_code == 416 and resume_from:
+                # Range starts at EOF: the .part already holds the whole file
+                response.close()
+                if self._finalize_part(part_path, local_path):
+                    logger.info("Downloaded: %s -> %s", asset_data['title'], local_path)
+                    self.db.complete_download(download_id, True)
+                    return True
+                # Not a valid file - it was deleted, fetch again from byte 0
+                resume_from = 0
+                del headers['Range']
+                headers['Accept-Encoding'] = ACCEPT_ENCODING
+                response = requests.get(download_url, headers=headers, **request_kwargs)
             response.raise_for_status()
+            if response.status_code != 206:
+                resume_from = 0  # Server ignored the Range - start over
 
             # Check if response is HTML (indicates login page or error)
             content_type = response.headers.get('content-type', '').lower()
             if 'text/html' in content_type:
-                print(f"Warning: Received HTML instead of file for {asset_data['title']}")
-                print(f"URL: {download_url}")
-                print(f"Content-Type: {content_type}")
-                # Still save it for debugging, but mark as failed
+                logger.warning("Received HTML instead of file for %s (URL: %s, Content-Type: %s)",
+                               asset_data['title'], download_url, content_type)
 
             total_size = int(response.headers.get('content-length', 0))
+            if total_size:
+                total_size += resume_from
 
-            with open(local_path, 'wb') as file:
-                downloaded = 0
-                with tqdm(total=total_size, unit='B', unit_scale=True, desc=asset_data['title'][:50]) as pbar:
-                    for chunk in response.iter_content(chunk_size=config.CHUNK_SIZE):
+            # Validated on the first chunk; a resumed body starts mid-file, so it's checked at the end
+            header_ok = True if resume_from else None
+            file_ext = local_path.suffix.lower()
+
+            with open(part_path, 'ab' if resume_from else 'wb') as file:
+                downloaded = resume_from
+                last_flush_bytes, last_flush_time = resume_from, time.monotonic()
+                # Repaint at most 4x/s and only on a terminal (logs/pipes get no bar)
+                with tqdm(total=total_size, initial=resume_from, unit='B', unit_scale=True,
+                          desc=asset_data['title'][:50], mininterval=0.25,
+                          miniters=max(1, total_size // 200), disable=not sys.stderr.isatty()) as pbar:
+                    for chunk in self._iter_body(response):
                         if chunk:
+                            if header_ok is None:
+                                header_ok = self._is_valid_header(chunk, file_ext)
+                                if not header_ok:
+                                    break  # HTML/error page - don't pull the rest of it
                             file.write(chunk)
                             downloaded += len(chunk)
                             pbar.update(len(chunk))
 
-                            # Update progress in database
-                            progress = (downloaded / total_size * 100) if total_size > 0 else 0
-                            self.db.update_download_progress(download_id, progress, downloaded)
+                            # Update progress in database (throttled)
+                            if (downloaded - last_flush_bytes >= self.PROGRESS_FLUSH_BYTES
+                                    or time.monotonic() - last_flush_time > self.PROGRESS_FLUSH_SECONDS):
+                                self._flush_progress(download_id, downloaded, total_size)
+                                last_flush_bytes, last_flush_time = downloaded, time.monotonic()
+
+                if downloaded != last_flush_bytes:
+                    self._flush_progress(download_id, downloaded, total_size)
+
+            if header_ok:
+                # Only complete files ever appear under the final name
+                os.replace(part_path, local_path)
+            else:
+                response.close()
+                part_path.unlink(missing_ok=True)  # HTML/error page - nothing worth resuming
 
             # Validate downloaded file
-            if self._is_valid_file(local_path):
-                print(f"Downloaded: {asset_data['title']} -> {local_path}")
+            if header_ok and (not resume_from or self._is_valid_file(local_path)):
+                logger.info("Downloaded: %s -> %s", asset_data['title'], local_path)
                 self.db.complete_download(download_id, True)
                 return True
             else:
-                error_msg = f"Downloaded file is invalid (likely HTML page)"
-                print(f"Error: {error_msg}")
+                error_msg = "Downloaded file is invalid (likely HTML page)"
+                logger.error("%s: %s", error_msg, asset_data['title'])
                 self.db.complete_download(download_id, False, error_msg)
                 return False
 
         except Exception as e:
-            print(f"Error downloading {asset_data['title']}: {e}")
+            logger.error("Error downloading %s: %s", asset_data['title'], e)
             if 'download_id' in locals():
                 self.db.complete_download(download_id, False, str(e))
             return False
     
-    async def download_asset_async(self, asset_data: Dict) -> bool:
-        """Asynchronous download method"""
+    async def download_asset_async(self, asset_data: Dict, download_id: int = None,
+                                   completions: List = None) -> bool:
+        """Asynchronous download method
+        
+        download_id/completions let download_multiple_assets pre-register the download
+        and collect the final status for one batched write instead of a commit per file.
+        """
         try:
             download_url = asset_data.get('download_url')
             if not download_url:
-                print(f"No download URL for asset: {asset_data['title']}")
+                logger.warning("No download URL for asset: %s", asset_data['title'])
                 return False
             
             local_path = self._create_local_path(asset_data)
-            download_id = self.db.add_download(asset_data['id'], str(local_path))
+            if download_id is None:
+                download_id = self.db.add_download(asset_data['id'], str(local_path))
             
-            if local_path.exists():
-                print(f"File already exists: {local_path}")
-                self.db.complete_download(download_id, True)
+            try:
+                os.stat(local_path)
+            except FileNotFoundError:
+                pass
+            else:
+                logger.info("File already exists: %s", local_path)
+                self._complete(download_id, True, None, completions)
                 return True
             
-            local_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(local_path.parent)
+            
+            # Resume an interrupted download from its .part file
+            part_path = self._part_path(local_path)
+            resume_from = self._partial_size(part_path)
+            headers = {'Range': f'bytes={resume_from}-', 'Accept-Encoding': 'identity'} if resume_from else None
+            
+            host = urlparse(download_url).netloc
+            chunk_size = self._chunk_size_for(host)
+            request_start = time.monotonic()
             
-            async with self.session.get(download_url) as response:
+            async with self.session.get(download_url, headers=headers) as response:
+                rtt = time.monotonic() - request_start
+                if response.status == 416 and resume_from:
+                    # Range starts at EOF: the .part already holds the whole file
+                    response.release()
+                    loop = asyncio.get_running_loop()
+                    if await loop.run_in_executor(self._io_executor, self._finalize_part, part_path, local_path):
+                        logger.info("Downloaded: %s -> %s", asset_data['title'], local_path)
+                        self._complete(download_id, True, None, completions)
+                        return True
+                    # Not a valid file - it was deleted, so the retry starts from byte 0
+                    return await self.download_asset_async(asset_data, download_id, completions)
                 response.raise_for_status()
+                if response.status != 206:
+                    resume_from = 0  # Server ignored the Range - start over
                 total_size = int(response.headers.get('content-length', 0))
+                if total_size:
+                    total_size += resume_from
                 
-                with open(local_path, 'wb') as file:
-                    downloaded = 0
-                    async for chunk in response.content.iter_chunked(config.CHUNK_SIZE):
-                        file.write(chunk)
+                # Raw fd: skip the buffered-IO layer, chunks are already large
+                # O_BINARY: Windows opens raw fds in text mode and would rewrite \n as \r\n
+                flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0) | (0 if resume_from else os.O_TRUNC)
+                fd = os.open(part_path, flags, 0o644)
+                loop = asyncio.get_running_loop()
+                pending_write = None
+                downloaded = confirmed = resume_from  # confirmed: bytes known to be on disk
+                released = resume_from  # Bytes already dropped from the page cache
+                stream_past_cache = total_size > _LARGE_DOWNLOAD_BYTES
+                # Validated on the first chunk; a resumed body starts mid-file
+                header_ok = True if resume_from else None
+                file_ext = local_path.suffix.lower()
+                try:
+                    # No fallocate: the .part size is the resume offset, so it must only grow with written bytes
+                    os.lseek(fd, resume_from, os.SEEK_SET)
+                    last_flush_bytes, last_flush_time = resume_from, time.monotonic()
+                    body_start = last_flush_time
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        if header_ok is None:
+                            header_ok = self._is_valid_header(chunk, file_ext)
+                            if not header_ok:
+                                response.close()  # HTML/error page - drop the connection
+                                break
+                        # Keep one write in flight off the event loop while the next chunk arrives
+                        if pending_write is not None:
+                            await asyncio.shield(pending_write)
+                            confirmed = downloaded
+                        # Large files: every 64 MiB write back what's done and evict it from the cache
+                        release_upto = 0
+                        if stream_past_cache and confirmed - released >= _LARGE_DOWNLOAD_BYTES:
+                            release_upto = released = confirmed
+                        pending_write = loop.run_in_executor(self._io_executor, _write_all, fd, chunk, release_upto)
                         downloaded += len(chunk)
                         
-                        progress = (downloaded / total_size * 100) if total_size > 0 else 0
-                        self.db.update_download_progress(download_id, progress, downloaded)
+                        if (downloaded - last_flush_bytes >= self.PROGRESS_FLUSH_BYTES
+                                or time.monotonic() - last_flush_time > self.PROGRESS_FLUSH_SECONDS):
+                            self._flush_progress(download_id, downloaded, total_size)
+                            last_flush_bytes, last_flush_time = downloaded, time.monotonic()
+                    
+                    if pending_write is not None:
+                        await asyncio.shield(pending_write)
+                    if header_ok:
+                        self._record_transfer(host, downloaded - resume_from, time.monotonic() - body_start, rtt)
+                finally:
+                    # Never close the fd under a write that's still running
+                    if pending_write is not None:
+                        if not pending_write.done():
+                            await asyncio.wait([pending_write])
+                        if not pending_write.cancelled() and pending_write.exception() is None:
+                            confirmed = downloaded
+                    # Keep only bytes that reached the file so a later resume starts at the right offset
+                    os.ftruncate(fd, confirmed)
+                    os.close(fd)
+                
+                if downloaded != last_flush_bytes:
+                    self._flush_progress(download_id, downloaded, total_size)
+            
+            # Only complete files ever appear under the final name
+            if header_ok and resume_from:
+                # A resumed body starts mid-file, so the file's header is only checked now
+                header_ok = await loop.run_in_executor(self._io_executor, self._finalize_part, part_path, local_path)
+            elif header_ok:
+                await loop.run_in_executor(self._io_executor, os.replace, part_path, local_path)
             
-            print(f"Downloaded: {asset_data['title']} -> {local_path}")
-            self.db.complete_download(download_id, True)
+            if not header_ok:
+                part_path.unlink(missing_ok=True)
+                error_msg = "Downloaded file is invalid (likely HTML page)"
+                logger.error("%s: %s", error_msg, asset_data['title'])
+                self._complete(download_id, False, error_msg, completions)
+                return False
+            
+            logger.info("Downloaded: %s -> %s", asset_data['title'], local_path)
+            self._complete(download_id, True, None, completions)
             return True
             
         except Exception as e:
-            print(f"Error downloading {asset_data['title']}: {e}")
-            self.db.complete_download(download_id, False, str(e))
+            logger.error("Error downloading %s: %s", asset_data['title'], e)
+            if download_id is not None:
+                self._complete(download_id, False, str(e), completions)
             return False
     
     async def download_multiple_assets(self, assets: List[Dict]) -> Dict:
         """Download multiple assets concurrently"""
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_DOWNLOADS)
+        # Register all downloads in one transaction up front
+        planned, rows = [], []
+        for asset in assets:
+            if not asset.get('download_url'):
+                continue
+            try:
+                rows.append((asset['id'], str(self._create_local_path(asset))))
+            except Exception:
+                continue  # download_asset_async reports the error for this asset
+            planned.append(asset)
+        download_ids = dict(zip(map(id, planned), self.db.add_downloads_bulk(rows)))
+        
+        # Final statuses are collected here and written in one batch
+        completions = []
+        results = []
         
-        async def download_with_semaphore(asset):
-            async with semaphore:
-                return await self.download_asset_async(asset)
+        # Fixed worker pool pulling from a bounded queue - no task per asset up front
+        worker_count = max(1, config.MAX_CONCURRENT_DOWNLOADS)
+        queue = asyncio.Queue(maxsize=2 * worker_count)
         
-        tasks = [download_with_semaphore(asset) for asset in assets]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # One aggregate bar for the batch instead of one per file
+        pbar = tqdm(total=len(assets), unit='file', desc='Downloading', mininterval=0.25,
+                    disable=not sys.stderr.isatty())
+        
+        async def worker():
+            while True:
+                asset = await queue.get()
+                try:
+                    results.append(await self.download_asset_async(asset, download_ids.get(id(asset)), completions))
+                except Exception:
+                    results.append(False)
+                finally:
+                    pbar.update(1)
+                    queue.task_done()
+        
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+        try:
+            for asset in assets:
+                await queue.put(asset)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            pbar.close()
+            self.db.complete_downloads_bulk(completions)
         
         successful = sum(1 for result in results if result is True)
-        failed = len(results) - successful
+        failed = len(assets) - successful
         
         return {
             'total': len(assets),
@@ -176,25 +475,93 @@ class AssetDownloader:
             'failed': failed
         }
     
+    @staticmethod
+    def _iter_body(response):
+        """Chunks of a streamed requests response, straight from urllib3 when nothing needs decoding"""
+        encoding = response.headers.get('content-encoding', '').strip().lower()
+        if encoding not in ('', 'identity'):
+            return response.iter_content(chunk_size=_DOWNLOAD_CHUNK)  # gzip/br: let requests decode
+        # Skip iter_content's generator layers: one raw read per chunk until EOF (b'')
+        response.raw.decode_content = False
+        read = response.raw.read
+        return iter(lambda: read(_DOWNLOAD_CHUNK), b'')
+    
+    def _complete(self, download_id: int, success: bool, error_message: Optional[str],
+                  completions: Optional[List]):
+        """Record the final status now, or buffer it for a batched write"""
+        if completions is None:
+            self.db.complete_download(download_id, success, error_message)
+        else:
+            completions.append((download_id, success, error_message))
+    
+    def _chunk_size_for(self, host: str) -> int:
+        """Read size ~ bandwidth-delay product of the host, 1 MiB until we've measured it"""
+        stats = self._host_stats.get(host)
+        if not stats:
+            return _DOWNLOAD_CHUNK
+        seconds_per_byte, rtt = stats
+        return min(max(int(rtt / seconds_per_byte), _MIN_ADAPTIVE_CHUNK), _MAX_ADAPTIVE_CHUNK)
+    
+    def _record_transfer(self, host: str, nbytes: int, elapsed: float, rtt: float):
+        """Fold one download's throughput into the host's EWMA (alpha=0.9 on history)"""
+        if nbytes < _MIN_ADAPTIVE_CHUNK or elapsed <= 0:
+            return  # Too small to say anything about bandwidth
+        # Averaging seconds/byte (not bytes/second) gives a harmonic mean of the rates
+        seconds_per_byte = elapsed / nbytes
+        previous = self._host_stats.get(host)
+        if previous:
+            seconds_per_byte = 0.9 * previous[0] + 0.1 * seconds_per_byte
+            rtt = 0.9 * previous[1] + 0.1 * rtt
+        self._host_stats[host] = (seconds_per_byte, rtt)
+    
+    @staticmethod
+    def _part_path(local_path: Path) -> Path:
+        """Temporary name a download is written to until it completes"""
+        return local_path.with_name(local_path.name + '.part')
+    
+    @staticmethod
+    def _partial_size(part_path: Path) -> int:
+        """Bytes already downloaded into a leftover .part file (0 if none)"""
+        try:
+            return os.stat(part_path).st_size
+        except FileNotFoundError:
+            return 0
+    
+    def _finalize_part(self, part_path: Path, local_path: Path) -> bool:
+        """Move a fully downloaded .part into place, or delete it if it isn't a valid file"""
+        try:
+            with open(part_path, 'rb') as f:
+                first_bytes = f.read(100)
+            if first_bytes and self._is_valid_header(first_bytes, local_path.suffix.lower()):
+                os.replace(part_path, local_path)
+                return True
+            part_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+    
+    def _flush_progress(self, download_id: int, downloaded: int, total_size: int):
+        """Write current download progress to the database"""
+        progress = (downloaded / total_size * 100) if total_size > 0 else 0
+        self.db.update_download_progress(download_id, progress, downloaded)
+    
+    def _ensure_dir(self, directory: Path):
+        """mkdir -p, skipped for directories we've already created"""
+        if directory not in self._known_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
+    
     def _create_local_path(self, asset_data: Dict) -> Path:
         """Create local file path for asset"""
         # Create directory structure: downloads/site_name/category/
-        site_dir = self.download_dir / asset_data['source_site']
-        category_dir = site_dir / asset_data.get('category', 'other')
+        category_dir = _category_dir(self.download_dir, asset_data['source_site'],
+                                     asset_data.get('category', 'other'))
         
         # Clean filename
         filename = self._clean_filename(asset_data['title'])
         
         # Try to determine file extension from download URL
-        download_url = asset_data.get('download_url', '')
-        parsed_url = urlparse(download_url)
-        url_path = parsed_url.path
-        
-        if '.' in url_path:
-            extension = Path(url_path).suffix
-        else:
-            # Default to .zip for archives
-            extension = '.zip'
+        extension = _url_extension(asset_data.get('download_url') or '')
         
         if not filename.endswith(extension):
             filename += extension
@@ -203,53 +570,35 @@ class AssetDownloader:
     
     def _clean_filename(self, filename: str) -> str:
         """Clean filename for filesystem compatibility"""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Limit length
-        if len(filename) > 100:
-            filename = filename[:100]
-        
-        return filename.strip()
+        # Replace invalid characters and limit length
+        return filename.translate(_FN_TABLE)[:100].strip()
     
     def _is_valid_file(self, file_path: Path) -> bool:
         """Check if downloaded file is valid (not HTML)"""
         try:
-            if not file_path.exists() or file_path.stat().st_size == 0:
+            if os.stat(file_path).st_size == 0:
                 return False
 
             # Read first few bytes to check file type
             with open(file_path, 'rb') as f:
                 first_bytes = f.read(100)
 
-            # Check if it's HTML
-            if b'<html' in first_bytes.lower() or b'<!doctype' in first_bytes.lower():
-                return False
-
-            # Check file extension vs content
-            file_ext = file_path.suffix.lower()
-
-            if file_ext == '.zip':
-                return first_bytes.startswith(b'PK')
-            elif file_ext in ['.jpg', '.jpeg']:
-                return first_bytes.startswith(b'\xff\xd8\xff')
-            elif file_ext == '.png':
-                return first_bytes.startswith(b'\x89PNG')
-            elif file_ext in ['.gif']:
-                return first_bytes.startswith(b'GIF')
-            elif file_ext in ['.fbx', '.obj', '.dae']:
-                return True  # 3D files are harder to validate
-            elif file_ext == '.txt':
-                return True
-            else:
-                # For unknown extensions, just check it's not HTML
-                return True
+            return self._is_valid_header(first_bytes, file_path.suffix.lower())
 
         except Exception:
             return False
 
+    @staticmethod
+    def _is_valid_header(first_bytes: bytes, file_ext: str) -> bool:
+        """Check the leading bytes of a download (not HTML, matching the extension's magic)"""
+        # Check if it's HTML (first 100 bytes only)
+        if _HTML_SNIFF.search(first_bytes, 0, 100):
+            return False
+
+        # Check file extension vs content - unknown extensions only need to be non-HTML
+        magic = _EXT_MAGIC.get(file_ext)
+        return magic is None or first_bytes.startswith(magic)
+
     def get_download_stats(self) -> Dict:
         """Get download statistics"""
         return self.db.get_download_stats()
@@ -5,6 +5,7 @@
 """
 
 import argparse
+import logging
 import sys
 from asset_manager import AssetManager
 import config
@@ -49,6 +50,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Downloader progress is logged at INFO; show it like the rest of the CLI output
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     if not args.command:
         parser.print_help()
         return
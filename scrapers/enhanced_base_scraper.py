@@ -5,6 +5,7 @@ All new scrapers should inherit from this class for maximum protection
 
 import time
 import random
+import threading
 import requests
 import logging
 from abc import ABC, abstractmethod
@@ -58,6 +59,7 @@ class EnhancedBaseScraper(ABC):
         self.last_request_time = 0
         self.min_delay = 1.0
         self.max_delay = 5.0
+        self._delay_lock = threading.Lock()  # Keeps pacing intact when called from threads
         
     def _create_enhanced_session(self) -> requests.Session:
         """Create enhanced session with security headers"""
@@ -217,9 +219,6 @@ class EnhancedBaseScraper(ABC):
     
     def _apply_intelligent_delay(self):
         """Apply intelligent delay between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
         # Calculate delay based on success rate
         success_rate = self.stats['successful_requests'] / max(1, self.stats['requests_made'])
         
@@ -233,12 +232,15 @@ class EnhancedBaseScraper(ABC):
             # Normal delay
             delay = random.uniform(self.min_delay, self.max_delay)
         
-        # Ensure minimum time between requests
-        if time_since_last < delay:
-            sleep_time = delay - time_since_last
-            time.sleep(sleep_time)
+        # Ensure minimum time between requests. The send slot is reserved under
+        # the lock so concurrent callers queue up instead of firing together.
+        with self._delay_lock:
+            current_time = time.time()
+            send_time = max(current_time, self.last_request_time + delay)
+            self.last_request_time = send_time
         
-        self.last_request_time = time.time()
+        if send_time > current_time:
+            time.sleep(send_time - current_time)
     
     def get_soup(self, url: str, **kwargs) -> Optional[BeautifulSoup]:
         """Get BeautifulSoup object with security"""
@@ -0,0 +1,23 @@
+"""File extension detection of the downloader"""
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("aiohttp")
+pytest.importorskip("tqdm")
+
+from downloader import _url_extension
+
+
+@pytest.mark.parametrize("url, extension", [
+    ("https://example.com/files/pack.zip", ".zip"),
+    ("https://example.com/files/sprite.png?v=2#top", ".png"),
+    ("https://example.com/files/pack.zip/", ".zip"),
+    ("https://example.com/files/models.v2/", ".v2"),
+    ("//cdn.example.com/assets/tree.glb", ".glb"),
+    ("//cdn.example.com/assets/sheet.png/", ".png"),
+    ("//cdn.example.com/download", ".zip"),
+    ("https://example.com/download/", ".zip"),
+])
+def test_url_extension(url, extension):
+    assert _url_extension(url) == extension
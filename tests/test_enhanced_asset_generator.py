@@ -0,0 +1,40 @@
+"""Prompt analysis of EnhancedAssetGenerator"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from enhanced_asset_generator import EnhancedAssetGenerator
+
+
+@pytest.fixture
+def generator():
+    # Prompt analysis needs only the palettes, not the database
+    gen = EnhancedAssetGenerator.__new__(EnhancedAssetGenerator)
+    gen.color_palettes = gen._generate_color_palettes()
+    return gen
+
+
+@pytest.mark.parametrize("prompt, category", [
+    ("two swords", "weapon"),
+    ("menu buttons", "ui"),
+    ("fantasy icons", "icon"),
+    ("pixel characters", "character"),
+])
+def test_plural_prompts_match_category(generator, prompt, category):
+    assert generator._analyze_prompt(prompt)['category'] == category
+
+
+@pytest.mark.parametrize("prompt, style", [
+    ("pixel-art hero", "pixel"),
+    ("sci-fi panel", "scifi"),
+    ("retro-style sword", "pixel"),
+])
+def test_hyphenated_prompts_match_style(generator, prompt, style):
+    assert generator._analyze_prompt(prompt)['style'] == style
+
+
+def test_tokenize_keeps_whole_and_split_words():
+    tokens = EnhancedAssetGenerator._tokenize("Low-Poly Swords")
+    assert {'low-poly', 'low', 'poly', 'swords', 'sword'} <= tokens